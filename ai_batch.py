@@ -0,0 +1,293 @@
+"""
+Batch AI verdicts: request verdicts for many trades concurrently on an
+asyncio client, under a request-rate limit and a total token budget, with
+retries and exponential backoff, writing one JSON line per trade.
+
+Usage: python ai_batch.py trades.json [--output verdicts.jsonl] [--concurrency 4]
+                         [--rpm 60] [--token-budget 100000] [--retries 3] [--stub]
+                         [--teams 10] [--first-year 2027]
+
+trades.json is a JSON list (or a .jsonl file) of
+    {"team_1": "Team A", "team_2": "Team B",
+     "players_1": ["Player"], "players_2": ["Player", ...],
+     "picks_1": [[1, 2027]], "picks_2": [],
+     "value_1": 310.5, "value_2": 298.0}
+where picks are [round, year] pairs and values are optional (computed from
+the rankings and the simple pick curve when missing, for the league's size
+and next draft year as the app computes them).
+
+Verdicts share the verdict cache with the app, so cached trades cost nothing.
+Test against the local fake server with OPENAI_API_BASE (see fake_completion_server.py).
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+from ai_verdict import MAX_TOKENS, VerdictService, build_messages, get_service, trade_fingerprint
+from draft_value import TEAM_COUNT, DraftPickSimple
+
+CONCURRENCY = 4
+REQUESTS_PER_MINUTE = 60
+TOKEN_BUDGET = 100_000
+RETRIES = 3
+BACKOFF_BASE = 1.0  # seconds, doubled per attempt
+REQUEST_TIMEOUT = 60.0
+
+# Errors that retrying won't fix (checked by name so openai stays an optional import)
+NON_RETRYABLE = {"InvalidRequestError", "AuthenticationError", "PermissionError", "ValueError", "TypeError"}
+
+@dataclass
+class TradeRequest:
+    team_1: str
+    team_2: str
+    players_1: List[str] = field(default_factory=list)
+    players_2: List[str] = field(default_factory=list)
+    picks_1: List[DraftPickSimple] = field(default_factory=list)
+    picks_2: List[DraftPickSimple] = field(default_factory=list)
+    value_1: Optional[float] = None
+    value_2: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TradeRequest":
+        return cls(
+            team_1=data["team_1"],
+            team_2=data["team_2"],
+            players_1=list(data.get("players_1", [])),
+            players_2=list(data.get("players_2", [])),
+            picks_1=[DraftPickSimple(int(r), int(y)) for r, y in data.get("picks_1", [])],
+            picks_2=[DraftPickSimple(int(r), int(y)) for r, y in data.get("picks_2", [])],
+            value_1=data.get("value_1"),
+            value_2=data.get("value_2"),
+        )
+
+    def args(self):
+        return (self.team_1, self.team_2, self.players_1, self.players_2, self.value_1, self.value_2, self.picks_1, self.picks_2)
+
+@dataclass
+class VerdictResult:
+    index: int
+    team_1: str
+    team_2: str
+    fingerprint: str
+    status: str  # ok, cached, failed or skipped
+    verdict: str = ""
+    error: str = ""
+    attempts: int = 0
+    elapsed: float = 0.0
+
+def league_settings():
+    """(team count, next draft year) of the ESPN league, as the app values picks; defaults if it can't load."""
+    from update_rankings import load_espn_league
+
+    league = load_espn_league()
+    if league is None:
+        print(f"⚠️ Could not load the league; valuing picks for {TEAM_COUNT} teams without a year discount.")
+        return TEAM_COUNT, None
+    return len(league.teams), league.year + 1
+
+def fill_values(trades: List[TradeRequest], team_count: int = TEAM_COUNT, first_year: Optional[int] = None):
+    """
+    Fill in missing trade values from the rankings and the simple pick curve,
+    for a league of team_count teams whose next draft is first_year.
+    """
+    from player_value import get_dynasty_values, get_simple_draft_pick_value
+    from rankings import clean_player_name
+
+    for trade in trades:
+        if trade.value_1 is None:
+            trade.value_1 = float(get_dynasty_values([clean_player_name(n) for n in trade.players_1]).sum()) + \
+                sum(get_simple_draft_pick_value(p, team_count, first_year) for p in trade.picks_1)
+        if trade.value_2 is None:
+            trade.value_2 = float(get_dynasty_values([clean_player_name(n) for n in trade.players_2]).sum()) + \
+                sum(get_simple_draft_pick_value(p, team_count, first_year) for p in trade.picks_2)
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose
+    return max(1, len(text) // 4)
+
+class RateLimiter:
+    """Spaces request starts evenly to stay under requests_per_minute."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class TokenBudget:
+    """Reserves an upper bound before each request and settles the estimate after."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+
+    def reserve(self, tokens: int) -> bool:
+        if tokens > self.remaining:
+            return False
+        self.remaining -= tokens
+        return True
+
+    def settle(self, reserved: int, used: int):
+        self.remaining += reserved - used
+
+async def _complete(backend, messages, timeout):
+    acomplete = getattr(backend, "acomplete", None)
+    if acomplete is not None:
+        return await acomplete(messages, timeout=timeout)
+    # Backends without an async client run on a worker thread
+    return await asyncio.wait_for(asyncio.to_thread(backend.complete, messages), timeout)
+
+async def _verdict_with_retries(index, trade, service, limiter, budget, semaphore, retries, timeout) -> VerdictResult:
+    model = getattr(service.backend, "model", "")
+    key = trade_fingerprint(*trade.args(), model=model)
+    result = VerdictResult(index, trade.team_1, trade.team_2, key, status="ok")
+    started = time.perf_counter()
+
+    cached = service.cache.get(key)
+    if cached is not None:
+        result.status, result.verdict = "cached", cached
+        return result
+
+    messages = build_messages(*trade.args())
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+    reserved = prompt_tokens + MAX_TOKENS
+
+    async with semaphore:
+        # Reserved only once a slot is free, so finished requests' unused tokens are reusable
+        if not budget.reserve(reserved):
+            result.status, result.error = "skipped", "token budget exhausted"
+            return result
+        for attempt in range(1, retries + 2):
+            result.attempts = attempt
+            await limiter.acquire()
+            try:
+                verdict = await _complete(service.backend, messages, timeout)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+                if type(e).__name__ in NON_RETRYABLE or attempt > retries:
+                    break
+                # Exponential backoff with jitter
+                await asyncio.sleep(BACKOFF_BASE * 2 ** (attempt - 1) * (0.5 + random.random()))
+                continue
+
+            budget.settle(reserved, prompt_tokens + estimate_tokens(verdict))
+            service.cache.put(key, verdict)
+            result.verdict, result.error = verdict, ""
+            result.elapsed = round(time.perf_counter() - started, 3)
+            return result
+
+    budget.settle(reserved, 0)
+    result.status = "failed"
+    result.elapsed = round(time.perf_counter() - started, 3)
+    return result
+
+async def run_batch_async(
+    trades: List[TradeRequest],
+    output_path: Optional[str] = None,
+    service: Optional[VerdictService] = None,
+    concurrency: int = CONCURRENCY,
+    requests_per_minute: float = REQUESTS_PER_MINUTE,
+    token_budget: int = TOKEN_BUDGET,
+    retries: int = RETRIES,
+    timeout: float = REQUEST_TIMEOUT
+) -> List[VerdictResult]:
+    """
+    Request verdicts for every trade concurrently. Results are appended to
+    output_path as JSON lines in completion order and returned in input order.
+    """
+    service = service or get_service()
+    limiter = RateLimiter(requests_per_minute)
+    budget = TokenBudget(token_budget)
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.create_task(_verdict_with_retries(i, trade, service, limiter, budget, semaphore, retries, timeout))
+        for i, trade in enumerate(trades)
+    ]
+
+    results: List[VerdictResult] = []
+    out = open(output_path, "w", encoding="utf-8") if output_path else None
+    try:
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            results.append(result)
+            if out is not None:
+                out.write(json.dumps(asdict(result)) + "\n")
+                out.flush()
+    finally:
+        if out is not None:
+            out.close()
+    return sorted(results, key=lambda r: r.index)
+
+def run_batch(
+    trades: List[TradeRequest],
+    output_path: Optional[str] = None,
+    team_count: Optional[int] = None,
+    first_year: Optional[int] = None,
+    **options,
+) -> List[VerdictResult]:
+    # Missing values must match the app's, or the verdict cache keys won't
+    if any(t.value_1 is None or t.value_2 is None for t in trades):
+        if team_count is None or first_year is None:
+            league_teams, league_first_year = league_settings()
+            team_count = league_teams if team_count is None else team_count
+            first_year = league_first_year if first_year is None else first_year
+        fill_values(trades, team_count, first_year)
+    return asyncio.run(run_batch_async(trades, output_path, **options))
+
+def load_trades(path) -> List[TradeRequest]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+    return [TradeRequest.from_dict(r) for r in records]
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Request AI verdicts for a batch of trades.")
+    parser.add_argument("trades", help="JSON list or JSONL file of trades")
+    parser.add_argument("--output", default="verdicts.jsonl", help="JSONL results file (default verdicts.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--rpm", type=float, default=REQUESTS_PER_MINUTE, help="max requests started per minute")
+    parser.add_argument("--token-budget", type=int, default=TOKEN_BUDGET, help="max estimated tokens for the whole batch")
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    parser.add_argument("--stub", action="store_true", help="use the offline stub backend")
+    parser.add_argument("--teams", type=int, help="league size for missing pick values (default: from the league)")
+    parser.add_argument("--first-year", type=int, help="next draft year for missing pick values (default: from the league)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    service = None
+    if args.stub:
+        from ai_verdict import StubBackend
+        service = VerdictService(StubBackend())
+
+    trades = load_trades(args.trades)
+    start = time.perf_counter()
+    results = run_batch(
+        trades,
+        args.output,
+        team_count=args.teams,
+        first_year=args.first_year,
+        service=service,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        token_budget=args.token_budget,
+        retries=args.retries,
+    )
+    counts = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"✅ {len(results)} verdicts in {time.perf_counter() - start:.1f}s ({summary}), saved to {args.output}")
@@ -0,0 +1,334 @@
+"""
+AI trade verdicts with a two-tier cache and request coalescing.
+
+Verdicts are keyed by a canonical trade fingerprint (sorted player names and
+picks per side, trade values rounded to a bucket, model and prompt version),
+kept in an in-memory LRU with a TTL and persisted to data/cache/verdicts so
+repeat lookups across reruns and restarts never hit the API. Concurrent
+requests for the same trade share one API call.
+
+Verdicts can also be streamed token by token (stream_trade_verdict) with an
+overall timeout and a cancel Event. Backends implement complete() and
+stream(); OPENAI_API_BASE points the OpenAI backend at a local fake server
+(fake_completion_server.py), and AI_VERDICT_BACKEND=stub uses a canned
+in-process backend (no network or key).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+PROMPT_VERSION = 2
+MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+SYSTEM_PROMPT = "You are a fantasy baseball expert analyzing trade fairness."
+MAX_TOKENS = 250
+TEMPERATURE = 0.7
+STREAM_TIMEOUT = float(os.getenv("AI_VERDICT_TIMEOUT", 30))  # seconds for a whole streamed verdict
+
+VALUE_BUCKET = 5.0  # trade values within the same bucket share a verdict
+CACHE_DIR = os.path.join("data", "cache", "verdicts")
+CACHE_TTL = float(os.getenv("AI_VERDICT_TTL", 7 * 24 * 60 * 60))  # seconds
+MEMORY_CACHE_SIZE = 256
+
+def _names(items) -> List[str]:
+    return [getattr(item, "name", item) for item in items]
+
+def build_messages(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1=(), picks_2=()) -> List[dict]:
+    assets_1 = _names(players_1) + [str(p) for p in picks_1]
+    assets_2 = _names(players_2) + [str(p) for p in picks_2]
+    msg = f"Team 1 ({team1_name}) trades {', '.join(assets_1)}. "
+    msg += f"Team 2 ({team2_name}) trades {', '.join(assets_2)}. "
+    msg += f"Team 1 value: {value_1:.2f}, Team 2 value: {value_2:.2f}. Who wins the trade? Suggest fair modifications if any."
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": msg},
+    ]
+
+def trade_fingerprint(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1=(), picks_2=(), model=MODEL) -> str:
+    """Canonical key for a trade: order of selection and small value changes don't matter."""
+    canonical = {
+        "teams": [team1_name, team2_name],
+        "players": [sorted(_names(players_1)), sorted(_names(players_2))],
+        "picks": [sorted(str(p) for p in picks_1), sorted(str(p) for p in picks_2)],
+        "values": [round(value_1 / VALUE_BUCKET), round(value_2 / VALUE_BUCKET)],
+        "model": model,
+        "prompt_version": PROMPT_VERSION,
+    }
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+class OpenAIBackend:
+    """Chat completions through the openai package (imported on first use)."""
+
+    def __init__(self, model: str = MODEL, api_key: Optional[str] = None, api_base: Optional[str] = None):
+        self.model = model
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.api_base = api_base or os.getenv("OPENAI_API_BASE")
+
+    def _client(self):
+        import openai
+        openai.api_key = self.api_key
+        if self.api_base:
+            openai.api_base = self.api_base
+        return openai
+
+    def complete(self, messages: List[dict], max_tokens: int = MAX_TOKENS, temperature: float = TEMPERATURE) -> str:
+        response = self._client().ChatCompletion.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message['content'].strip()
+
+    async def acomplete(self, messages: List[dict], max_tokens: int = MAX_TOKENS, temperature: float = TEMPERATURE,
+                        timeout: float = STREAM_TIMEOUT) -> str:
+        """asyncio variant of complete() over openai's aiohttp client."""
+        response = await self._client().ChatCompletion.acreate(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            request_timeout=timeout
+        )
+        return response.choices[0].message['content'].strip()
+
+    def stream(self, messages: List[dict], max_tokens: int = MAX_TOKENS, temperature: float = TEMPERATURE,
+               timeout: float = STREAM_TIMEOUT) -> Iterator[str]:
+        response = self._client().ChatCompletion.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            request_timeout=timeout
+        )
+        for chunk in response:
+            token = chunk.choices[0].get("delta", {}).get("content")
+            if token:
+                yield token
+
+class StubBackend:
+    """Offline backend: a deterministic verdict built from the prompt, no network."""
+
+    model = "stub"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def complete(self, messages: List[dict], max_tokens: int = MAX_TOKENS, temperature: float = TEMPERATURE) -> str:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self._verdict(messages)
+
+    async def acomplete(self, messages: List[dict], max_tokens: int = MAX_TOKENS, temperature: float = TEMPERATURE,
+                        timeout: float = STREAM_TIMEOUT) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._verdict(messages)
+
+    def stream(self, messages: List[dict], max_tokens: int = MAX_TOKENS, temperature: float = TEMPERATURE,
+               timeout: float = STREAM_TIMEOUT) -> Iterator[str]:
+        self.calls += 1
+        words = self._verdict(messages).split(" ")
+        for i, word in enumerate(words):
+            if self.delay:
+                time.sleep(self.delay / len(words))
+            yield word if i == 0 else f" {word}"
+
+    @staticmethod
+    def _verdict(messages: List[dict]) -> str:
+        digest = hashlib.sha1(messages[-1]["content"].encode("utf-8")).hexdigest()[:8]
+        return f"[stub verdict {digest}] Both sides get comparable value; the trade looks fair."
+
+def default_backend():
+    if os.getenv("AI_VERDICT_BACKEND", "openai").lower() == "stub":
+        return StubBackend()
+    return OpenAIBackend()
+
+class VerdictCache:
+    """In-memory LRU with TTL in front of a directory of JSON files."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = CACHE_TTL, max_entries: int = MEMORY_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if now - data.get("created_at", 0) >= self.ttl:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            return None
+        self._remember(key, data["created_at"], data["verdict"])
+        return data["verdict"]
+
+    def put(self, key: str, verdict: str):
+        created_at = time.time()
+        self._remember(key, created_at, verdict)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": created_at, "verdict": verdict}, f)
+        os.replace(tmp_path, self._path(key))
+
+    def _remember(self, key: str, created_at: float, verdict: str):
+        with self._lock:
+            self._memory[key] = (created_at, verdict)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+class VerdictCancelled(Exception):
+    pass
+
+class VerdictService:
+    """Cached, coalesced verdict lookups over a pluggable backend."""
+
+    def __init__(self, backend=None, cache: Optional[VerdictCache] = None):
+        self.backend = backend or default_backend()
+        self.cache = cache or VerdictCache()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def verdict(self, team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1=(), picks_2=()) -> str:
+        model = getattr(self.backend, "model", MODEL)
+        key = trade_fingerprint(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1, picks_2, model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            # Someone is already asking for this trade; share their answer
+            return future.result()
+
+        try:
+            messages = build_messages(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1, picks_2)
+            verdict = self.backend.complete(messages)
+            self.cache.put(key, verdict)
+            future.set_result(verdict)
+            return verdict
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stream(self, team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1=(), picks_2=(),
+               timeout: float = STREAM_TIMEOUT, cancel: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Yield the verdict as it is generated. Cached verdicts are yielded whole.
+        Raises TimeoutError past the timeout and VerdictCancelled once cancel
+        is set; partial verdicts are never cached. Closing the generator early
+        (e.g. a Streamlit rerun) also abandons the request.
+        """
+        model = getattr(self.backend, "model", MODEL)
+        key = trade_fingerprint(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1, picks_2, model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            yield future.result(timeout=timeout)
+            return
+
+        deadline = time.monotonic() + timeout
+        tokens: List[str] = []
+        try:
+            messages = build_messages(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1, picks_2)
+            tokens_stream = self.backend.stream(messages, timeout=timeout)
+            try:
+                for token in tokens_stream:
+                    if cancel is not None and cancel.is_set():
+                        raise VerdictCancelled("AI verdict cancelled")
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"AI verdict timed out after {timeout:g}s")
+                    tokens.append(token)
+                    yield token
+            finally:
+                close = getattr(tokens_stream, "close", None)
+                if close is not None:
+                    close()
+
+            verdict = "".join(tokens).strip()
+            self.cache.put(key, verdict)
+            future.set_result(verdict)
+        except BaseException as e:
+            # Includes GeneratorExit when the consumer stops early
+            future.set_exception(e if isinstance(e, Exception) else VerdictCancelled("AI verdict abandoned"))
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+_service: Optional[VerdictService] = None
+_service_lock = threading.Lock()
+
+def get_service() -> VerdictService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = VerdictService()
+    return _service
+
+def ai_trade_verdict(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1: Sequence = (), picks_2: Sequence = ()) -> str:
+    try:
+        return get_service().verdict(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1, picks_2)
+    except Exception as e:
+        return f"AI verdict unavailable: {e}"
+
+def stream_trade_verdict(team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1: Sequence = (),
+                         picks_2: Sequence = (), timeout: float = STREAM_TIMEOUT,
+                         cancel: Optional[threading.Event] = None) -> Iterator[str]:
+    """Streaming ai_trade_verdict: yields tokens, ending with an error note instead of raising."""
+    try:
+        yield from get_service().stream(
+            team1_name, team2_name, players_1, players_2, value_1, value_2, picks_1, picks_2,
+            timeout=timeout, cancel=cancel
+        )
+    except GeneratorExit:
+        raise
+    except Exception as e:
+        yield f"\n\nAI verdict unavailable: {e}"
@@ -1,16 +1,22 @@
 import streamlit as st
-from espn_api.baseball import League
-from draft_value import DraftPickValuator, DraftPickSimple
-from dataclasses import dataclass
 import datetime
 import os
 from dotenv import load_dotenv
-import pandas as pd
-import openai
 import logging
 
-from rankings import fetch_all_sources, combine_rankings, clean_player_name
+# Heavy dependencies (espn_api, openai, the scrapers, pyarrow) are imported on
+# first use below so the page can paint before they load.
+from ai_verdict import stream_trade_verdict
+from cache_registry import registry
+from draft_value import TEAM_COUNT, DraftPickSimple, get_valuator
+from league_snapshot import load_league_snapshot, offline_mode, sync_league_snapshot
+from rankings import clean_player_name
 from player_value import get_dynasty_value, get_simple_draft_pick_value
+from rankings_store import get_store
+from roster_values import LeagueValuationTable
+
+st.set_page_config(page_title="Dynasty Trade Analyzer", layout="wide")
+st.title("🏆 Dynasty Trade Analyzer with Draft Picks")
 
 # Load environment variables from .env file
 load_dotenv()
@@ -26,59 +32,84 @@ try:
     ESPN_S2 = os.getenv("ESPN_S2")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-    if not (SWID and ESPN_S2):
+    if not (SWID and ESPN_S2) and not offline_mode():
         raise ValueError("Missing SWID or ESPN_S2 tokens")
-    if not OPENAI_API_KEY:
+    if not OPENAI_API_KEY and os.getenv("AI_VERDICT_BACKEND", "openai").lower() != "stub":
         raise ValueError("Missing OpenAI API key")
 except Exception as e:
     st.error(f"Error loading environment variables: {e}")
     st.stop()
 
-openai.api_key = OPENAI_API_KEY
-
-st.set_page_config(page_title="Dynasty Trade Analyzer", layout="wide")
-st.title("🏆 Dynasty Trade Analyzer with Draft Picks")
-
 DRAFT_ROUNDS = 16
+DRAFT_YEARS = int(os.getenv("DRAFT_YEARS", 3))  # future drafts whose picks can be traded
 NEXT_DRAFT_YEAR = SEASON_YEAR + 1
 
-@dataclass
-class DraftPickSimple:
-    round_number: int
-    year: int
-
-    def __str__(self):
-        suffix = {1: "st", 2: "nd", 3: "rd"}.get(
-            self.round_number if self.round_number < 20 else 0, "th"
-        )
-        return f"{self.year} {self.round_number}{suffix} Round Pick"
-
-@st.cache_resource(show_spinner=False)
-def load_league_cached():
+def load_league():
     logging.info("Loading ESPN League data...")
     try:
-        league = League(league_id=LEAGUE_ID, year=SEASON_YEAR, swid=SWID, espn_s2=ESPN_S2)
+        # Served from the on-disk snapshot when fresh (or the fixture in offline mode)
+        league = load_league_snapshot(LEAGUE_ID, SEASON_YEAR, espn_s2=ESPN_S2, swid=SWID)
         logging.info("League loaded successfully.")
         return league
     except Exception as e:
         logging.error(f"Failed to load league: {e}")
         return None
 
-@st.cache_data
-def load_rankings_csv(file_path="data/dynasty_rankings_cleaned.csv"):
-    if not os.path.exists(file_path):
-        st.warning(f"⚠️ Missing rankings file: {file_path}. Please run the ranking update workflow.")
-        return pd.DataFrame(columns=["name"])
-    try:
-        df = pd.read_csv(file_path)
-        if "name" not in df.columns:
-            st.warning(f"⚠️ Rankings CSV missing 'name' column: {file_path}")
-            return pd.DataFrame(columns=["name"])
-        df["name"] = df["name"].astype(str).str.strip().str.lower()
-        return df
-    except Exception as e:
-        st.warning(f"⚠️ Failed to load rankings CSV {file_path}: {e}")
-        return pd.DataFrame(columns=["name"])
+# League-derived artifacts. Syncing the league invalidates exactly these; the
+# rankings store and anything keyed only on rankings stay warm.
+registry.register("league", load_league)
+registry.register("team_lookup", lambda league: {t.team_name: t for t in league.teams}, depends_on=["league"])
+registry.register(
+    "rosters",
+    lambda league: {t.team_id: {p.name: p for p in t.roster} for t in league.teams},
+    depends_on=["league"],
+)
+registry.register(
+    "standings_team_ids",
+    lambda league: [t.team_id for t in sorted(league.teams, key=lambda t: t.wins)],
+    depends_on=["league"],
+)
+# Memoized on the standings order, so a sync that doesn't reshuffle standings reuses it
+registry.register(
+    "pick_valuator",
+    lambda standings_team_ids: get_valuator(
+        standings_team_ids, rounds=DRAFT_ROUNDS, years=DRAFT_YEARS, first_year=NEXT_DRAFT_YEAR
+    ),
+    depends_on=["standings_team_ids"],
+)
+registry.register(
+    "league_values",
+    lambda league: LeagueValuationTable(league, get_store().index),
+    depends_on=["league"],
+    key=lambda: get_store().version,
+)
+
+def project_standings(league, league_values):
+    from standings_sim import simulate_standings
+    return simulate_standings(league.teams, league_values.team_totals(), fingerprint=league.fingerprint)
+
+def projected_valuator(projection):
+    standings_team_ids, slot_probabilities = projection.valuator_inputs()
+    return get_valuator(
+        standings_team_ids, rounds=DRAFT_ROUNDS, years=DRAFT_YEARS, first_year=NEXT_DRAFT_YEAR,
+        slot_probabilities=slot_probabilities,
+    )
+
+# Monte Carlo standings projection; rebuilt on league sync or a rankings refresh
+registry.register(
+    "standings_projection",
+    project_standings,
+    depends_on=["league", "league_values"],
+    key=lambda: get_store().version,
+)
+registry.register("projected_pick_valuator", projected_valuator, depends_on=["standings_projection"])
+
+def load_league_cached():
+    league = registry.get("league")
+    if league is None:
+        # Don't cache a failed load
+        registry.invalidate("league")
+    return league
 
 def get_team_logo(team):
     logo = getattr(team, "logo_url", "")
@@ -86,55 +117,39 @@ def get_team_logo(team):
         logo = "https://via.placeholder.com/75?text=No+Logo"
     return logo
 
-def calculate_trade_value(players, picks, pick_valuator=None, mode="simple", team_id=None):
-    player_value = sum(get_dynasty_value(clean_player_name(p.name)) for p in players)
+def calculate_trade_value(players, picks, pick_valuator=None, mode="simple", team_id=None, league_values=None, team_count=TEAM_COUNT):
+    if league_values is not None and team_id is not None:
+        # Summed from the precomputed league valuation table
+        player_value = league_values.players_value(team_id, [p.name for p in players])
+    else:
+        player_value = sum(get_dynasty_value(clean_player_name(p.name)) for p in players)
     if mode == "advanced" and pick_valuator and team_id is not None:
-        picks_value = sum(pick_valuator.get_pick_value(team_id, p.round_number) for p in picks)
+        picks_value = sum(pick_valuator.get_pick_value(team_id, p.round_number, p.year) for p in picks)
     else:
-        picks_value = sum(get_simple_draft_pick_value(p) for p in picks)
+        picks_value = sum(get_simple_draft_pick_value(p, team_count, NEXT_DRAFT_YEAR) for p in picks)
     return player_value + picks_value
 
 def refresh_rankings():
     try:
         st.info("Refreshing dynasty rankings (this may take a moment)...")
+        from rankings import fetch_all_sources, combine_rankings
         dfs = fetch_all_sources(load_league_cached())
-        df = combine_rankings(dfs)
-        output_path = os.path.join("data", "dynasty_rankings_cleaned.csv")
-        df.to_csv(output_path, index=False)
+        combine_rankings(dfs)
         return "✅ Dynasty rankings refreshed and saved."
     except Exception as e:
         return f"Error refreshing rankings: {e}"
 
-def ai_trade_verdict(team1_name, team2_name, players_1, players_2, value_1, value_2):
-    try:
-        msg = f"Team 1 ({team1_name}) trades {', '.join([p.name for p in players_1])}. "
-        msg += f"Team 2 ({team2_name}) trades {', '.join([p.name for p in players_2])}. "
-        msg += f"Team 1 value: {value_1:.2f}, Team 2 value: {value_2:.2f}. Who wins the trade? Suggest fair modifications if any."
-
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a fantasy baseball expert analyzing trade fairness."},
-                {"role": "user", "content": msg}
-            ],
-            temperature=0.7,
-            max_tokens=250
-        )
-        return response.choices[0].message['content'].strip()
-    except Exception as e:
-        return f"AI verdict unavailable: {e}"
-
-# Initialize or load league once and store in session state
-if "league" not in st.session_state:
-    league = load_league_cached()
-    if league is None:
-        st.error("Failed to load league data. Please check your ESPN credentials and network.")
-        st.stop()
-    st.session_state.league = league
-else:
-    league = st.session_state.league
+# Load the league once per process; later reruns hit the cache registry
+league = load_league_cached()
+if league is None:
+    st.error("Failed to load league data. Please check your ESPN credentials and network.")
+    st.stop()
 
-rankings_df = load_rankings_csv()
+# Shared with rankings.py / player_value.py; hot-swapped when rankings are refreshed
+rankings_snapshot = get_store().snapshot()
+rankings_df = rankings_snapshot.frame
+if rankings_df.empty:
+    st.warning("⚠️ Rankings data is missing or unreadable. Please run the ranking update workflow.")
 
 # Initialize session state variables if missing
 for key in ["trade_from_team_1", "trade_from_team_2", "trade_picks_team_1_rounds", "trade_picks_team_2_rounds"]:
@@ -163,16 +178,27 @@ with st.sidebar:
     )
     st.session_state.pick_value_mode = mode
 
+    project_picks = False
+    if mode == "advanced":
+        project_picks = st.checkbox(
+            "Project standings (Monte Carlo)",
+            value=False,
+            help="Value next year's picks from simulated rest-of-season standings instead of current wins."
+        )
+
     if st.button("🔄 Sync League Data Now"):
         with st.spinner("Syncing league data..."):
-            st.cache_resource.clear()
-            league = load_league_cached()
-            if league is None:
+            try:
+                # Refreshes rosters and standings in place rather than rebuilding the league
+                changed = sync_league_snapshot(league, espn_s2=ESPN_S2, swid=SWID)
+            except Exception as e:
+                logging.error(f"Failed to sync league: {e}")
                 st.error("Failed to reload league data.")
             else:
-                st.session_state.league = league
+                # Drops only the league-derived artifacts (rosters, team lookup, pick valuator)
+                registry.put("league", league)
                 st.session_state.last_sync = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                st.success(f"✅ League data synced at {st.session_state.last_sync}")
+                st.success(f"✅ League data synced at {st.session_state.last_sync} ({len(changed)} teams changed)")
 
 if st.session_state.last_sync:
     st.caption(f"Last synced: {st.session_state.last_sync}")
@@ -181,13 +207,20 @@ team_names = [team.team_name for team in league.teams]
 
 pick_valuator = None
 if st.session_state.pick_value_mode == "advanced":
-    standings_team_ids = [team.team_id for team in sorted(league.teams, key=lambda t: t.wins)]
-    pick_valuator = DraftPickValuator(standings_team_ids)
+    if project_picks:
+        with st.spinner("Simulating rest-of-season standings..."):
+            pick_valuator = registry.get("projected_pick_valuator")
+    else:
+        pick_valuator = registry.get("pick_valuator")
 
 def pick_suffix(n):
     return {1: "st", 2: "nd", 3: "rd"}.get(n if n < 20 else 0, "th")
 
-draft_pick_options = [f"{NEXT_DRAFT_YEAR} {rnd}{pick_suffix(rnd)} Round Pick" for rnd in range(1, DRAFT_ROUNDS + 1)]
+draft_pick_options = [
+    f"{year} {rnd}{pick_suffix(rnd)} Round Pick"
+    for year in range(NEXT_DRAFT_YEAR, NEXT_DRAFT_YEAR + DRAFT_YEARS)
+    for rnd in range(1, DRAFT_ROUNDS + 1)
+]
 
 def parse_pick_string(pick_str):
     parts = pick_str.split()
@@ -196,9 +229,9 @@ def parse_pick_string(pick_str):
         if round_str.endswith(suffix):
             round_str = round_str[:-len(suffix)]
             break
-    return int(round_str)
+    return DraftPickSimple(int(round_str), int(parts[0]))
 
-tab_trade, tab_search, tab_compare = st.tabs(["Trade Analyzer", "Player Search", "Player Comparison"])
+tab_trade, tab_market, tab_search, tab_compare = st.tabs(["Trade Analyzer", "Trade Market", "Player Search", "Player Comparison"])
 
 with tab_trade:
     st.header("🤝 Trade Analyzer")
@@ -207,14 +240,20 @@ with tab_trade:
     team_1_name = col1.selectbox("Select Team 1", team_names)
     team_2_name = col2.selectbox("Select Team 2", team_names, index=1 if len(team_names) > 1 else 0)
 
-    team_1 = next(t for t in league.teams if t.team_name == team_1_name)
-    team_2 = next(t for t in league.teams if t.team_name == team_2_name)
+    team_lookup = registry.get("team_lookup")
+    team_1 = team_lookup[team_1_name]
+    team_2 = team_lookup[team_2_name]
 
     col1.image(get_team_logo(team_1), width=75)
     col2.image(get_team_logo(team_2), width=75)
 
-    roster_1 = {p.name: p for p in team_1.roster}
-    roster_2 = {p.name: p for p in team_2.roster}
+    league_values = registry.get("league_values")
+    col1.caption(f"Roster dynasty value: {league_values.team_total(team_1.team_id):.1f}")
+    col2.caption(f"Roster dynasty value: {league_values.team_total(team_2.team_id):.1f}")
+
+    rosters = registry.get("rosters")
+    roster_1 = rosters[team_1.team_id]
+    roster_2 = rosters[team_2.team_id]
 
     trade_from_team_1 = st.multiselect("Players from Team 1", list(roster_1.keys()))
     trade_from_team_2 = st.multiselect("Players from Team 2", list(roster_2.keys()))
@@ -225,11 +264,12 @@ with tab_trade:
     players_1 = [roster_1[name] for name in trade_from_team_1 if name in roster_1]
     players_2 = [roster_2[name] for name in trade_from_team_2 if name in roster_2]
 
-    picks_1 = [DraftPickSimple(parse_pick_string(pick_str), NEXT_DRAFT_YEAR) for pick_str in draft_picks_team_1]
-    picks_2 = [DraftPickSimple(parse_pick_string(pick_str), NEXT_DRAFT_YEAR) for pick_str in draft_picks_team_2]
+    picks_1 = [parse_pick_string(pick_str) for pick_str in draft_picks_team_1]
+    picks_2 = [parse_pick_string(pick_str) for pick_str in draft_picks_team_2]
 
-    value_1 = calculate_trade_value(players_1, picks_1, pick_valuator, st.session_state.pick_value_mode, team_1.team_id)
-    value_2 = calculate_trade_value(players_2, picks_2, pick_valuator, st.session_state.pick_value_mode, team_2.team_id)
+    team_count = len(league.teams)
+    value_1 = calculate_trade_value(players_1, picks_1, pick_valuator, st.session_state.pick_value_mode, team_1.team_id, league_values, team_count)
+    value_2 = calculate_trade_value(players_2, picks_2, pick_valuator, st.session_state.pick_value_mode, team_2.team_id, league_values, team_count)
 
     st.markdown("### Trade Value Summary")
     st.write(f"{team_1_name}: **{value_1:.2f}**")
@@ -255,10 +295,84 @@ with tab_trade:
         st.info("Trade is balanced")
 
     if st.button("🤖 AI Trade Verdict & Suggestions"):
-        with st.spinner("Analyzing with AI..."):
-            verdict = ai_trade_verdict(team_1_name, team_2_name, players_1, players_2, value_1, value_2)
-            st.markdown("### 🤖 Who Says No?")
-            st.write(verdict)
+        st.markdown("### 🤖 Who Says No?")
+        # Renders tokens as they arrive; cached verdicts appear at once. A rerun
+        # (any widget change) closes the stream and abandons the request.
+        st.write_stream(
+            stream_trade_verdict(team_1_name, team_2_name, players_1, players_2, value_1, value_2, picks_1, picks_2)
+        )
+
+    with st.expander("🔍 Find Balanced Trades"):
+        fcol1, fcol2, fcol3 = st.columns(3)
+        tolerance = fcol1.number_input("Value tolerance", min_value=0.0, value=10.0, step=5.0)
+        max_size = fcol2.slider("Max assets per side", 1, 4, 2)
+        min_value = fcol3.number_input("Minimum package value", min_value=0.0, value=100.0, step=25.0)
+        include_picks = st.checkbox("Include draft picks", value=True)
+
+        if st.button("Search Trades"):
+            from trade_finder import find_trades_between
+
+            with st.spinner("Searching for balanced trades..."):
+                search = find_trades_between(
+                    league_values,
+                    team_1.team_id,
+                    team_2.team_id,
+                    pick_valuator=pick_valuator,
+                    mode=st.session_state.pick_value_mode,
+                    rounds=DRAFT_ROUNDS,
+                    team_count=team_count,
+                    years=DRAFT_YEARS,
+                    first_year=NEXT_DRAFT_YEAR,
+                    include_picks=include_picks,
+                    tolerance=tolerance,
+                    max_size=max_size,
+                    min_value=min_value,
+                )
+            if not search.complete:
+                st.info("Search hit its time budget; showing the best trades found so far.")
+            if not search.packages:
+                st.warning("No trades found within the tolerance.")
+            for package in search.packages:
+                give = package.players_a + [f"{year} Round {r} Pick" for r, year in package.picks_a]
+                get = package.players_b + [f"{year} Round {r} Pick" for r, year in package.picks_b]
+                st.write(
+                    f"{team_1_name} sends {', '.join(give)} ({package.value_a:.1f}) ⇄ "
+                    f"{team_2_name} sends {', '.join(get)} ({package.value_b:.1f})"
+                )
+
+with tab_market:
+    st.header("📈 League Trade Market")
+    st.caption("Scans every team pair for trades that send surplus positions where they're needed.")
+
+    mcol1, mcol2 = st.columns(2)
+    market_tolerance = mcol1.number_input("Value tolerance", min_value=0.0, value=15.0, step=5.0, key="market_tolerance")
+    market_size = mcol2.slider("Max players per side", 1, 3, 2, key="market_size")
+    rescan = st.checkbox("Ignore cached scan", value=False)
+
+    if st.button("Scan Trade Market"):
+        from trade_market import MarketScan
+
+        league_values = registry.get("league_values")
+        team_by_id = {t.team_id: t.team_name for t in league.teams}
+        scan = MarketScan(league_values, league.fingerprint, tolerance=market_tolerance, max_size=market_size)
+        progress = st.progress(0.0)
+        pair_count = len(team_by_id) * (len(team_by_id) - 1) // 2
+        found = st.empty()
+
+        for done, pair in enumerate(scan.stream(force=rescan), start=1):
+            progress.progress(min(done / max(pair_count, 1), 1.0))
+            found.write(f"Scanned {done}/{pair_count} team pairs, {sum(len(p.trades) for p in scan.results)} candidate trades")
+
+        if scan.from_cache:
+            st.caption("Loaded from the cached scan of this league snapshot.")
+        if not scan.complete:
+            st.info("Scan hit its time budget; showing the trades found so far.")
+        for trade in scan.best_trades():
+            st.write(
+                f"**{team_by_id.get(trade.team_a)}** sends {', '.join(trade.package.players_a)} ⇄ "
+                f"**{team_by_id.get(trade.team_b)}** sends {', '.join(trade.package.players_b)} "
+                f"(need filled: {trade.need_gain_a:.1f} / {trade.need_gain_b:.1f})"
+            )
 
 with tab_compare:
     st.header("🔍 Player Comparison Tool")
@@ -270,12 +384,10 @@ with tab_compare:
     p2_name = col2.selectbox("Player 2", all_players, index=1 if len(all_players) > 1 else 0)
 
     def get_player_stats(name):
-        if not name or rankings_df.empty:
-            return {}
-        row = rankings_df[rankings_df["name"] == name.lower()]
-        if row.empty:
+        row = rankings_snapshot.index.row_of(name)
+        if row is None:
             return {}
-        return row.squeeze().to_dict()
+        return rankings_df.iloc[row].to_dict()
 
     stats1 = get_player_stats(p1_name)
     stats2 = get_player_stats(p2_name)
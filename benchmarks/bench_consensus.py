@@ -0,0 +1,136 @@
+"""
+Timing and invariant checks for the consensus merge (consensus.py).
+
+Builds synthetic prepared sources (overall lists that overlap, plus prospect
+lists that partly overlap them), times consensus_rankings and fails if the
+merged rankings break the merge rules:
+- a player only prospect lists rank never outranks a player an overall list ranks
+- the hand-built example below comes out in the expected order
+- a reported 0 (a 0.00 ERA, no saves) counts toward a merged stat, while a
+  stat the source doesn't report is skipped
+- recomputing dynasty_value from the published rankings gives the stored value
+
+Usage: python benchmarks/bench_consensus.py [players_per_source]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from consensus import PROSPECT_SOURCES, consensus_rankings, player_key  # noqa: E402
+from rankings import prepare_source  # noqa: E402
+from rankings_io import canonical_rankings  # noqa: E402
+from valuation import dynasty_values  # noqa: E402
+
+POSITIONS = ["C", "1B", "2B", "SS", "3B", "OF", "SP", "RP"]
+
+def synthetic_source(names, rng):
+    n = len(names)
+    return prepare_source(pd.DataFrame({
+        "name": names,
+        "position": rng.choice(POSITIONS, n),
+        "overall_rank": np.arange(1, n + 1),
+        "HR": rng.integers(0, 50, n),
+        "SB": rng.integers(0, 60, n),
+        "AVG": rng.uniform(0.150, 0.350, n).round(3),
+        "K": rng.integers(0, 300, n),
+        "ERA": rng.uniform(1.5, 7.0, n).round(2),
+    }))
+
+def synthetic_sources(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pool = [f"player {i}" for i in range(2 * n)]
+    prospects = [f"prospect {i}" for i in range(n)]
+    sources = {}
+    for name in ("fantasypros_hitters", "cbssports", "fangraphs_hitters"):
+        sources[name] = synthetic_source(list(rng.choice(pool, n, replace=False)), rng)
+    for name in sorted(PROSPECT_SOURCES):
+        # Mostly true prospects, plus some players the overall lists also rank
+        names = list(rng.choice(prospects, n // 2, replace=False)) + list(rng.choice(pool, n // 10, replace=False))
+        sources[name] = synthetic_source(list(rng.permutation(names)), rng)
+    return sources
+
+def check_prospects_ranked_below(sources, merged) -> bool:
+    overall_keys = set()
+    for name, df in sources.items():
+        if name not in PROSPECT_SOURCES:
+            overall_keys.update(player_key(df.loc[df["overall_rank"] > 0, "name"]))
+    ranked = merged[merged["overall_rank"] > 0]
+    listed = ranked["name"].isin(overall_keys)
+    if listed.all() or not listed.any():
+        return True
+    worst_listed = ranked.loc[listed, "overall_rank"].max()
+    best_prospect = ranked.loc[~listed, "overall_rank"].min()
+    if best_prospect < worst_listed:
+        print(f"❌ A prospect-only player is ranked {best_prospect}, ahead of an overall-list player at {worst_listed}")
+        return False
+    return True
+
+def check_example() -> bool:
+    sources = {
+        "fantasypros_hitters": pd.DataFrame({
+            "name": ["shohei ohtani", "bobby witt jr."], "position": ["DH", "SS"], "overall_rank": [1, 2],
+        }),
+        "prospectslive": pd.DataFrame({"name": ["jackson holliday"], "position": ["SS"], "overall_rank": [1]}),
+    }
+    merged = consensus_rankings({name: prepare_source(df) for name, df in sources.items()}).set_index("name")
+    expected = {"shohei ohtani": (1, 1), "bobby witt": (2, 1), "jackson holliday": (3, 2)}
+    actual = {name: tuple(int(v) for v in merged.loc[name, ["overall_rank", "pos_rank"]]) for name in expected}
+    if actual != expected:
+        print(f"❌ Example rankings (overall_rank, pos_rank) are {actual}, expected {expected}")
+        return False
+    return True
+
+def check_real_zeros() -> bool:
+    sources = {
+        "espn_pitchers": pd.DataFrame({
+            "name": ["closer"], "position": ["RP"], "overall_rank": [1], "SV": [0], "ERA": [0.0],
+        }),
+        "fangraphs_pitchers": pd.DataFrame({"name": ["closer"], "position": ["RP"], "overall_rank": [1], "SV": [10]}),
+    }
+    row = consensus_rankings({name: prepare_source(df) for name, df in sources.items()}).iloc[0]
+    # SV averages 0 and 10; ERA 0.00 earns the full ERA bonus, and WHIP (unreported) takes its default
+    expected = {"SV": 5.0, "ERA": 0.0, "dynasty_value": 105.0}
+    actual = {col: float(row[col]) for col in expected}
+    if actual != expected:
+        print(f"❌ Merged reliever is {actual}, expected {expected}")
+        return False
+    return True
+
+def check_values_recompute(merged) -> bool:
+    # What valuation.ensure_current_values does after a formula change
+    stored = canonical_rankings(merged)
+    recomputed = dynasty_values(stored)
+    mismatched = ~np.isclose(stored["dynasty_value"].to_numpy(), recomputed, rtol=0, atol=0.01)
+    if mismatched.any():
+        print(f"❌ {mismatched.sum()} stored dynasty values differ when recomputed from the file, e.g.:")
+        print(stored[mismatched].assign(recomputed=recomputed[mismatched]).head())
+        return False
+    return True
+
+def main(n):
+    sources = synthetic_sources(n)
+
+    start = time.perf_counter()
+    merged = consensus_rankings(sources)
+    merge_s = time.perf_counter() - start
+
+    print(f"sources:    {len(sources)} x {n} rows")
+    print(f"merged:     {len(merged)} players")
+    print(f"merge:      {merge_s * 1000:.1f} ms")
+
+    ok = check_prospects_ranked_below(sources, merged)
+    ok = check_example() and ok
+    ok = check_real_zeros() and ok
+    ok = check_values_recompute(merged) and ok
+    if not ok:
+        return 1
+    print("✅ Consensus rankings follow the merge rules")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1500))
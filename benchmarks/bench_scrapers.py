@@ -0,0 +1,143 @@
+"""
+End-to-end scraper benchmark on recorded fixtures.
+
+Replays fixtures/http (see scrapers/fixtures.py) through the local replay
+server and runs each registered fetch_* function: fetch, parse, normalize
+and DataFrame construction. Reports the best wall time, time spent inside
+fetch, tracemalloc peak and output size per source, and writes them to a
+JSON file tagged with the current commit so runs can be compared.
+
+Sources that need the ESPN league are skipped. Record a corpus first with
+`python -m scrapers.fixtures capture`.
+
+Usage: python benchmarks/bench_scrapers.py [--fixtures fixtures/http] [--repeat 3]
+                                          [--sources fangraphs_hitters,cbssports]
+                                          [--output bench_scrapers.json] [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers import fixtures  # noqa: E402
+from scrapers.orchestrator import registered_sources  # noqa: E402
+
+REGRESSION_THRESHOLD = 1.25  # flag sources at least 25% slower or bigger than the baseline
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def run_source(source, session):
+    session.fetch_seconds = 0.0
+    start = time.perf_counter()
+    df = source.fetch()
+    return df, time.perf_counter() - start, session.fetch_seconds
+
+def bench_source(source, session, repeat):
+    best = None
+    for _ in range(repeat):
+        df, total, fetch_s = run_source(source, session)
+        if best is None or total < best[1]:
+            best = (df, total, fetch_s)
+    df, total, fetch_s = best
+
+    tracemalloc.start()
+    source.fetch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "source": source.name,
+        "rows": int(len(df)),
+        "columns": int(len(df.columns)),
+        "total_ms": round(total * 1000, 1),
+        "fetch_ms": round(fetch_s * 1000, 1),
+        "process_ms": round((total - fetch_s) * 1000, 1),
+        "peak_mb": round(peak / 2**20, 2),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 3) if len(df.columns) else 0.0,
+    }
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["source"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        old = baseline.get(r["source"])
+        if old is None:
+            continue
+        for metric in ("total_ms", "peak_mb"):
+            if old[metric] > 0 and r[metric] / old[metric] >= REGRESSION_THRESHOLD:
+                regressions.append(f"{r['source']} {metric}: {old[metric]} -> {r[metric]}")
+        if r["rows"] != old["rows"]:
+            regressions.append(f"{r['source']} rows: {old['rows']} -> {r['rows']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every scraper end-to-end on recorded fixtures.")
+    parser.add_argument("--fixtures", default=fixtures.FIXTURE_DIR, help="fixture directory")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sources", default=None, help="comma-separated source names (default all)")
+    parser.add_argument("--output", default="bench_scrapers.json")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to check for regressions")
+    args = parser.parse_args()
+
+    session = fixtures.set_mode("replay", args.fixtures)
+    if not session.store.index:
+        print(f"❌ No fixtures in {args.fixtures}; record some with `python -m scrapers.fixtures capture`")
+        return 1
+
+    wanted = set(args.sources.split(",")) if args.sources else None
+    sources = [
+        s for s in registered_sources()
+        if not s.needs_league and (wanted is None or s.name in wanted)
+    ]
+
+    results = []
+    for source in sources:
+        session.misses.clear()
+        try:
+            result = bench_source(source, session, args.repeat)
+        except Exception as e:
+            print(f"⚠️ {source.name} failed: {e}")
+            continue
+        result["missing_fixtures"] = sorted(set(session.misses))
+        results.append(result)
+    fixtures.set_mode(None)
+
+    print(f"{'source':<22}{'rows':>7}{'total ms':>11}{'fetch ms':>11}{'process ms':>12}{'peak MiB':>10}")
+    for r in results:
+        print(f"{r['source']:<22}{r['rows']:>7}{r['total_ms']:>11.1f}{r['fetch_ms']:>11.1f}{r['process_ms']:>12.1f}{r['peak_mb']:>10.2f}")
+        if r["missing_fixtures"]:
+            print(f"  ⚠️ no fixture for {len(r['missing_fixtures'])} URL(s), e.g. {r['missing_fixtures'][0]}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": git_commit(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+            "results": results,
+        }, f, indent=2)
+    print(f"Saved results to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            return 1
+        print(f"✅ No regressions against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
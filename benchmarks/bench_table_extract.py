@@ -0,0 +1,162 @@
+"""
+Parse time and peak memory of the single-pass table extractor against the
+BeautifulSoup + str(table) + pd.read_html(flavor="html5lib") round trip the
+scrapers used before, on saved HTML pages.
+
+With no pages given, synthetic rankings pages are written once to
+data/cache/bench_fixtures/ (a FantasyPros-style page with one id="data"
+table and a CBS-style page with a table per position, both padded with
+navigation, scripts and unrelated tables) and benchmarked. Each page is
+checked for parity: both paths must produce the same frames.
+
+Usage: python benchmarks/bench_table_extract.py [page.html ...] [--table-id data]
+                                               [--repeat 3] [--output results.json]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.table_extract import find_table, read_tables  # noqa: E402
+
+FIXTURE_DIR = os.path.join("data", "cache", "bench_fixtures")
+POSITIONS = ["C", "1B", "2B", "SS", "3B", "OF", "SP", "RP"]
+
+def _page_chrome(rng, links=400):
+    nav = "".join(f'<li><a href="/p/{i}">Link {i}</a></li>' for i in range(links))
+    script = "<script>var data = " + json.dumps({"k": rng.integers(0, 100, 2000).tolist()}) + ";</script>"
+    promo = "<table class='promo'><tr><td>Ad</td><td>Sponsored</td></tr></table>"
+    return f"<head><title>Rankings</title>{script}</head><body><nav><ul>{nav}</ul></nav>{promo}"
+
+def _ranking_rows(rng, start, n, position=None):
+    rows = []
+    for i in range(start, start + n):
+        pos = position or POSITIONS[i % len(POSITIONS)]
+        rows.append(
+            f"<tr><td>{i + 1}</td><td><a href='/players/{i}'>Player {i}</a> <small>(TM{i % 30})</small></td>"
+            f"<td>{pos}</td><td>{pos}{i // len(POSITIONS) + 1}</td>"
+            f"<td>{rng.integers(0, 50)}</td><td>{rng.integers(0, 130)}</td><td>{rng.integers(0, 130)}</td>"
+            f"<td>{rng.integers(0, 60)}</td><td>{rng.integers(0, 110)}</td><td>{rng.uniform(0.15, 0.35):.3f}</td></tr>"
+        )
+    return "".join(rows)
+
+HEADER = "<tr><th>Rank</th><th>Player</th><th>Pos</th><th>Pos Rank</th><th>HR</th><th>R</th><th>RBI</th><th>SB</th><th>BB</th><th>AVG</th></tr>"
+
+def synthetic_pages(players=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    fantasypros = (
+        "<html>" + _page_chrome(rng)
+        + f"<table id='data'><thead>{HEADER}</thead><tbody>{_ranking_rows(rng, 0, players)}</tbody></table>"
+        + "<footer>" + "<p>Footer text</p>" * 500 + "</footer></body></html>"
+    )
+    per_position = players // len(POSITIONS)
+    cbs = "<html>" + _page_chrome(rng) + "".join(
+        f"<h2>{pos}</h2><table><thead>{HEADER}</thead><tbody>{_ranking_rows(rng, i * per_position, per_position, pos)}</tbody></table>"
+        for i, pos in enumerate(POSITIONS)
+    ) + "</body></html>"
+    return {"fantasypros_data.html": (fantasypros, "data"), "cbs_positions.html": (cbs, None)}
+
+def write_fixtures():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    pages = []
+    for filename, (html, table_id) in synthetic_pages().items():
+        path = os.path.join(FIXTURE_DIR, filename)
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+        pages.append((path, table_id))
+    return pages
+
+def bs4_read_html(html, table_id):
+    """The old path: full DOM, re-serialize the table(s), parse again."""
+    soup = BeautifulSoup(html, "html.parser")
+    if table_id is not None:
+        table = soup.find("table", {"id": table_id})
+        return [pd.read_html(io.StringIO(str(table)), flavor="html5lib")[0]]
+    frames = []
+    for table in soup.find_all("table"):
+        df = pd.read_html(io.StringIO(str(table)), flavor="html5lib")[0]
+        if "Player" in df.columns:
+            frames.append(df)
+    return frames
+
+def extract(html, table_id):
+    if table_id is not None:
+        return [find_table(html, table_id=table_id).to_frame()]
+    return read_tables(html, header="Player")
+
+def measure(func, html, table_id, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html, table_id)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(html, table_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+def frames_match(expected, actual) -> bool:
+    if len(expected) != len(actual):
+        return False
+    for a, b in zip(expected, actual):
+        try:
+            pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_dtype=False)
+        except AssertionError:
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML table extraction against bs4 + read_html.")
+    parser.add_argument("pages", nargs="*", help="saved HTML pages (default: synthetic fixtures)")
+    parser.add_argument("--table-id", default=None, help="id of the table to extract from the given pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    pages = [(path, args.table_id) for path in args.pages] or write_fixtures()
+    results = []
+    ok = True
+    for path, table_id in pages:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        old, old_s, old_peak = measure(bs4_read_html, html, table_id, args.repeat)
+        new, new_s, new_peak = measure(extract, html, table_id, args.repeat)
+        match = frames_match(old, new)
+        ok = ok and match
+        results.append({
+            "page": os.path.basename(path),
+            "bytes": len(html.encode("utf-8")),
+            "rows": int(sum(len(df) for df in new)),
+            "bs4_read_html_ms": round(old_s * 1000, 1),
+            "extract_ms": round(new_s * 1000, 1),
+            "speedup": round(old_s / new_s, 1) if new_s else None,
+            "bs4_read_html_peak_mb": round(old_peak / 2**20, 2),
+            "extract_peak_mb": round(new_peak / 2**20, 2),
+            "parity": match,
+        })
+
+    for r in results:
+        print(f"{r['page']} ({r['bytes'] / 1024:.0f} KiB, {r['rows']} rows)")
+        print(f"  bs4 + read_html: {r['bs4_read_html_ms']:8.1f} ms  peak {r['bs4_read_html_peak_mb']:6.2f} MiB")
+        print(f"  table_extract:   {r['extract_ms']:8.1f} ms  peak {r['extract_peak_mb']:6.2f} MiB  ({r['speedup']}x)")
+        print(f"  {'✅ frames match' if r['parity'] else '❌ frames differ'}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.output}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
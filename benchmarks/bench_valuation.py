@@ -0,0 +1,79 @@
+"""
+Parity check and timing for the vectorized dynasty_value engine.
+
+Builds a synthetic projection pool (majors plus every minor leaguer),
+values it with the scalar per-row reference functions and with
+valuation.dynasty_values, and fails if any row differs by more than a cent.
+
+Usage: python benchmarks/bench_valuation.py [player_count]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player_value import dynasty_value_hitter, dynasty_value_pitcher  # noqa: E402
+from valuation import dynasty_values  # noqa: E402
+
+def synthetic_pool(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "name": [f"player {i}" for i in range(n)],
+        "position": rng.choice(["C", "1B", "2B", "SS", "3B", "OF", "DH", "SP", "RP", "P"], n),
+        "HR": rng.integers(0, 50, n),
+        "R": rng.integers(0, 130, n),
+        "RBI": rng.integers(0, 130, n),
+        "SB": rng.integers(0, 60, n),
+        "AVG": rng.uniform(0.150, 0.350, n).round(3),
+        "BB": rng.integers(0, 110, n),
+        "W": rng.integers(0, 20, n),
+        "SV": rng.integers(0, 45, n),
+        "K": rng.integers(0, 300, n),
+        "ERA": rng.uniform(1.5, 7.0, n).round(2),
+        "WHIP": rng.uniform(0.8, 1.8, n).round(2),
+        "IP": rng.uniform(0, 220, n).round(1),
+    })
+
+def scalar_values(df):
+    def calc(row):
+        if row.get("position", "") in {"SP", "RP", "P"}:
+            return dynasty_value_pitcher(row)
+        return dynasty_value_hitter(row)
+    return df.apply(calc, axis=1).to_numpy(dtype=np.float64)
+
+def check_parity(df) -> bool:
+    expected = scalar_values(df)
+    actual = dynasty_values(df)
+    mismatched = ~np.isclose(expected, actual, rtol=0, atol=0.01 + 1e-9)
+    if mismatched.any():
+        print(f"❌ {mismatched.sum()} of {len(df)} rows differ, e.g.:")
+        print(df[mismatched].assign(scalar=expected[mismatched], vectorized=actual[mismatched]).head())
+        return False
+    return True
+
+def main(n):
+    df = synthetic_pool(n)
+
+    start = time.perf_counter()
+    scalar_values(df)
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dynasty_values(df)
+    vector_s = time.perf_counter() - start
+
+    print(f"players:    {n}")
+    print(f"apply:      {scalar_s * 1000:.1f} ms")
+    print(f"vectorized: {vector_s * 1000:.1f} ms ({scalar_s / vector_s:.0f}x)")
+
+    if not check_parity(df):
+        return 1
+    print("✅ Vectorized values match the scalar reference")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 12000))
@@ -0,0 +1,115 @@
+"""
+Import-time profile for the modules the Streamlit app loads before first paint.
+
+Runs each target in a fresh interpreter with `python -X importtime`, then
+reports the cumulative import cost per target and the slowest individual
+imports. Heavy dependencies that the app defers to first use (openai,
+espn_api, pyarrow, the scrapers) are profiled separately for comparison.
+
+Usage: python benchmarks/import_profile.py [--top N] [--output results.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything app.py imports at module level, in order
+APP_IMPORTS = [
+    "streamlit",
+    "dotenv",
+    "ai_verdict",
+    "cache_registry",
+    "draft_value",
+    "league_snapshot",
+    "rankings",
+    "player_value",
+    "rankings_store",
+    "roster_values",
+]
+
+# Imported lazily by the app; listed to show what first paint avoids
+DEFERRED_IMPORTS = [
+    "openai",
+    "espn_api.baseball",
+    "pyarrow",
+    "scrapers.scrape_fantasypros",
+]
+
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)")
+
+def profile_import(module):
+    """
+    Return (cumulative_us, [(cumulative_us, self_us, module_name)]) for importing
+    module in a fresh interpreter, or None if the import fails.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+
+    entries = []
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append((int(cumulative_us), int(self_us), name))
+        if name == module and not indent:
+            total = int(cumulative_us)
+    return total, entries
+
+def build_report(modules, top):
+    report = {}
+    for module in modules:
+        result = profile_import(module)
+        if result is None:
+            report[module] = {"error": "import failed"}
+            continue
+        total, entries = result
+        slowest = sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+        report[module] = {
+            "cumulative_ms": round(total / 1000, 1),
+            "slowest_self_ms": [
+                {"module": name, "self_ms": round(self_us / 1000, 1), "cumulative_ms": round(cum_us / 1000, 1)}
+                for cum_us, self_us, name in slowest
+            ],
+        }
+    return report
+
+def print_report(title, report):
+    print(f"\n{title}")
+    for module, result in report.items():
+        if "error" in result:
+            print(f"  {module:<24} (not installed)")
+            continue
+        print(f"  {module:<24} {result['cumulative_ms']:>8.1f} ms")
+        for entry in result["slowest_self_ms"]:
+            print(f"      {entry['module']:<36} {entry['self_ms']:>7.1f} ms self")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per target")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    # Importing the app's modules must not touch the network or the rankings file
+    app = build_report(APP_IMPORTS, args.top)
+    deferred = build_report(DEFERRED_IMPORTS, args.top)
+
+    print_report("App imports before first paint", app)
+    print_report("Deferred until first use", deferred)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "app": app, "deferred": deferred}, f, indent=2)
+        print(f"\n✅ Saved import profile to {args.output}")
+
+if __name__ == "__main__":
+    main()
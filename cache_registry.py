@@ -0,0 +1,88 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+_MISSING = object()
+
+class CacheRegistry:
+    """
+    Named, process-wide cache of derived artifacts with dependency tracking.
+
+    Each entry is registered with a builder and the names it depends on; the
+    builder receives the dependencies' values as positional arguments.
+    Invalidating an entry drops it and everything derived from it, and
+    nothing else, so e.g. a league sync doesn't throw away the rankings index.
+
+    An optional key callable lets an entry rebuild itself when an outside
+    version (a rankings generation, a snapshot fingerprint) changes.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[..., Any]] = {}
+        self._depends_on: Dict[str, Sequence[str]] = {}
+        self._key_fns: Dict[str, Optional[Callable[[], Any]]] = {}
+        self._values: Dict[str, Any] = {}
+        self._keys: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, builder: Callable[..., Any], depends_on: Sequence[str] = (), key: Optional[Callable[[], Any]] = None):
+        """Register (or re-register on a Streamlit rerun) an entry. Cached values are kept."""
+        with self._lock:
+            self._builders[name] = builder
+            self._depends_on[name] = tuple(depends_on)
+            self._key_fns[name] = key
+
+    def get(self, name: str) -> Any:
+        with self._lock:
+            key_fn = self._key_fns.get(name)
+            key = key_fn() if key_fn else None
+            value = self._values.get(name, _MISSING)
+            if value is not _MISSING and self._keys.get(name) == key:
+                return value
+            if value is not _MISSING:
+                # Outside version changed: anything built from the old value is stale too
+                self.invalidate(name)
+
+            args = [self.get(dep) for dep in self._depends_on.get(name, ())]
+            value = self._builders[name](*args)
+            self._values[name] = value
+            self._keys[name] = key
+            return value
+
+    def put(self, name: str, value: Any):
+        """Replace an entry's value (e.g. after an in-place sync) and drop its dependents."""
+        with self._lock:
+            for dependent in self.dependents(name):
+                self._drop(dependent)
+            self._values[name] = value
+            key_fn = self._key_fns.get(name)
+            self._keys[name] = key_fn() if key_fn else None
+
+    def invalidate(self, name: str) -> List[str]:
+        """Drop an entry and everything that depends on it. Returns the dropped names."""
+        with self._lock:
+            dropped = [name] + self.dependents(name)
+            for entry in dropped:
+                self._drop(entry)
+            return dropped
+
+    def dependents(self, name: str) -> List[str]:
+        """Every entry derived, directly or transitively, from name."""
+        with self._lock:
+            found: List[str] = []
+            frontier = [name]
+            while frontier:
+                current = frontier.pop()
+                for entry, deps in self._depends_on.items():
+                    if current in deps and entry not in found:
+                        found.append(entry)
+                        frontier.append(entry)
+            return found
+
+    def cached(self, name: str) -> bool:
+        return name in self._values
+
+    def _drop(self, name: str):
+        self._values.pop(name, None)
+        self._keys.pop(name, None)
+
+registry = CacheRegistry()
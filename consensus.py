@@ -0,0 +1,159 @@
+"""
+Consensus merge of per-source rankings into one row per player.
+
+Every source's rows are stacked and grouped by a canonical player key in a
+single groupby. Per player it computes the weighted mean, median, min and
+max of the overall ranks the sources gave, how many sources list the
+player, and each of MERGED_STATS as the source-weighted mean over the
+sources that report it. The consensus
+overall_rank / pos_rank are the players' order by weighted mean rank, and
+dynasty_value is recomputed from the merged stats.
+
+Prospect lists (PROSPECT_SOURCES) rank prospects only, so their rank 1 is
+not an overall rank 1. Their ranks never mix with overall ranks: players on
+any overall list are summarised from those lists alone, and players only on
+prospect lists are placed after the deepest overall rank, by their prospect
+summary. A prospect-only player can therefore never outrank a player an
+overall list ranks.
+
+A 0 rank means the source doesn't rank the player. Stats a source doesn't
+report are NaN in its prepared frame and are skipped, so a real 0 (a 0.00
+ERA, no saves) counts like any other value. In the merged rankings a stat
+no source reports is stored as STAT_DEFAULTS gives it (ERA 4.00, WHIP 1.30)
+or 0, the same values dynasty_value is computed from.
+"""
+import hashlib
+import json
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from player_index import STAT_DEFAULTS
+from rankings_io import RANKINGS_COLUMNS, normalize_rankings
+from valuation import dynasty_values
+
+DEFAULT_WEIGHT = 1.0
+# Prospect lists' stats are thin, so they count for less where other sources report them
+SOURCE_WEIGHTS: Dict[str, float] = {
+    "prospectslive": 0.5,
+    "mlb_pipeline": 0.5,
+}
+# Sources whose ranks are prospect-list ranks rather than overall ranks
+PROSPECT_SOURCES = frozenset({"prospectslive", "mlb_pipeline"})
+
+# Stats merged as the source-weighted mean over the sources that report them
+MERGED_STATS = [
+    "WAR", "OPS", "SLG", "OPS+",
+    "HR", "R", "RBI", "SB", "AVG", "BB",
+    "W", "SV", "K", "ERA", "WHIP", "IP",
+]
+
+# Bump when the aggregation itself changes, so staged refreshes rebuild
+MERGE_VERSION = 3
+
+_PARENS = r"\s*\(.*\)"
+_SUFFIX = r"\s+(?:jr\.|sr\.|iii|ii)$"
+
+def merge_signature() -> str:
+    """Identifies the merge rules; rankings built under other rules must be rebuilt."""
+    params = {
+        "version": MERGE_VERSION, "weights": SOURCE_WEIGHTS, "default": DEFAULT_WEIGHT,
+        "prospects": sorted(PROSPECT_SOURCES), "stats": MERGED_STATS,
+    }
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+def player_key(names: pd.Series) -> pd.Series:
+    """
+    Canonical player key: the name as rankings.clean_player_name leaves a
+    roster name (lowercase, no parenthesised team, no generational suffix),
+    with whitespace collapsed. Catches sources that lowercase before stripping.
+    """
+    key = names.astype(str).str.lower().str.replace(_PARENS, "", regex=True)
+    key = key.str.replace(_SUFFIX, "", regex=True)
+    return key.str.split().str.join(" ")
+
+def consensus_rankings(sources: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Merge prepared source frames (source name -> rows in SOURCE_COLUMNS),
+    in priority order, into one row per player in the rankings schema.
+    Where sources disagree on a player's position, the first source listing one wins.
+    """
+    frames = [
+        df.assign(_source=i, _weight=SOURCE_WEIGHTS.get(name, DEFAULT_WEIGHT), _prospect=name in PROSPECT_SOURCES)
+        for i, (name, df) in enumerate(sources.items())
+        if df is not None and not df.empty
+    ]
+    if not frames:
+        return normalize_rankings(pd.DataFrame(columns=RANKINGS_COLUMNS), parse_innings=False)
+
+    rows = pd.concat(frames, ignore_index=True)
+    rows["_key"] = player_key(rows["name"])
+    rows = rows[rows["_key"] != ""]
+    weight = rows["_weight"].to_numpy(dtype=np.float64)
+
+    rank = rows["overall_rank"].where(rows["overall_rank"] > 0).astype(np.float64)
+    prospect = rows["_prospect"].to_numpy(dtype=bool)
+    columns = {
+        "_key": rows["_key"],
+        "_source": rows["_source"],
+        "_position": rows["position"].where(rows["position"] != ""),
+    }
+    aggregations = {
+        "source_count": ("_source", "nunique"),
+        "position": ("_position", "first"),
+    }
+    # Overall and prospect-list ranks are summarised separately
+    for prefix, ranks in (("rank", rank.where(~prospect)), ("prospect", rank.where(prospect))):
+        columns[f"_{prefix}"] = ranks
+        columns[f"_{prefix}_w"] = ranks * weight
+        columns[f"_{prefix}_wt"] = np.where(ranks.notna(), weight, 0.0)
+        aggregations[f"{prefix}_sum"] = (f"_{prefix}_w", "sum")
+        aggregations[f"{prefix}_weight"] = (f"_{prefix}_wt", "sum")
+        aggregations[f"{prefix}_median"] = (f"_{prefix}", "median")
+        aggregations[f"{prefix}_min"] = (f"_{prefix}", "min")
+        aggregations[f"{prefix}_max"] = (f"_{prefix}", "max")
+    for col in MERGED_STATS:
+        values = rows[col].astype(np.float64)
+        columns[f"_{col}_w"] = values * weight
+        columns[f"_{col}_wt"] = np.where(values.notna(), weight, 0.0)
+        aggregations[f"{col}_sum"] = (f"_{col}_w", "sum")
+        aggregations[f"{col}_weight"] = (f"_{col}_wt", "sum")
+
+    merged = pd.DataFrame(columns).groupby("_key", sort=True).agg(**aggregations)
+
+    out = pd.DataFrame({"name": merged.index.to_numpy(), "position": merged["position"].fillna("").to_numpy()})
+    weights = merged["rank_weight"].to_numpy()
+    prospect_weights = merged["prospect_weight"].to_numpy()
+    overall_mean = np.where(weights > 0, merged["rank_sum"].to_numpy() / np.where(weights > 0, weights, 1), np.nan)
+    prospect_mean = np.where(
+        prospect_weights > 0, merged["prospect_sum"].to_numpy() / np.where(prospect_weights > 0, prospect_weights, 1), np.nan
+    )
+
+    # Players no overall list ranks go after the deepest overall rank, in prospect-list order
+    depth = rank[~prospect].max()
+    depth = 0.0 if pd.isna(depth) else float(depth)
+    prospect_only = ~(weights > 0) & (prospect_weights > 0)
+    out["rank_mean"] = np.where(prospect_only, depth + prospect_mean, overall_mean)
+    for stat in ("median", "min", "max"):
+        out[f"rank_{stat}"] = np.where(
+            prospect_only, depth + merged[f"prospect_{stat}"].to_numpy(), merged[f"rank_{stat}"].to_numpy()
+        )
+    out["source_count"] = merged["source_count"].to_numpy()
+    for col in MERGED_STATS:
+        stat_weights = merged[f"{col}_weight"].to_numpy()
+        out[col] = np.where(stat_weights > 0, merged[f"{col}_sum"].to_numpy() / np.where(stat_weights > 0, stat_weights, 1), np.nan)
+
+    # Consensus ranks: order by weighted mean rank (ties by best rank, then name); unranked players get 0
+    ranked = out[out["rank_mean"].notna()].sort_values(["rank_mean", "rank_min", "name"], kind="mergesort")
+    out["overall_rank"] = 0
+    out.loc[ranked.index, "overall_rank"] = np.arange(1, len(ranked) + 1)
+    out["pos_rank"] = 0
+    out.loc[ranked.index, "pos_rank"] = ranked.groupby("position", sort=False).cumcount().to_numpy() + 1
+
+    # Stats no source reports are stored at the formula defaults (ERA/WHIP) or 0,
+    # so recomputing dynasty_value from the published file gives the same value
+    out = out.fillna(STAT_DEFAULTS)
+    out["dynasty_value"] = dynasty_values(out)
+
+    return normalize_rankings(out, parse_innings=False)
@@ -1,25 +1,57 @@
+import hashlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
 
-# Constants defining league draft settings
+import numpy as np
+
+# Default league draft settings; the valuator takes the real league size from the standings
 TEAM_COUNT = 10
 ROUNDS = 16
 TOTAL_PICKS = TEAM_COUNT * ROUNDS
 
+# Multi-year pick valuation
+YEAR_DISCOUNT = 0.85  # value multiplier per year until the draft
+CERTAINTY_DECAY = 0.5  # confidence in the projected finish, per extra year out
+
 @dataclass
 class DraftPick:
     team_id: int
     round_number: int
-    pick_number: int  # Overall pick number (1 to TOTAL_PICKS)
+    pick_number: int  # Overall pick number (1 to team_count * rounds)
+    team_count: int = TEAM_COUNT
 
     def __str__(self) -> str:
         """
         Returns pick formatted as 'round.pick_in_round', e.g. '1.01', '16.10'.
         Zero-pads pick_in_round to 2 digits for clarity.
         """
-        pick_in_round = (self.pick_number - 1) % TEAM_COUNT + 1
+        pick_in_round = (self.pick_number - 1) % self.team_count + 1
         return f"{self.round_number}.{pick_in_round:02d}"
 
+@dataclass
+class DraftPickSimple:
+    """A pick identified only by round and draft year, as selected in the app."""
+    round_number: int
+    year: int
+
+    def __str__(self):
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(
+            self.round_number if self.round_number < 20 else 0, "th"
+        )
+        return f"{self.year} {self.round_number}{suffix} Round Pick"
+
+def draft_value_curve(
+    total_picks: int = TOTAL_PICKS,
+    base_value: float = 100,
+    decay_rate: float = 0.975
+) -> np.ndarray:
+    """
+    Exponential decay curve as an array: element i is the value of overall pick i + 1.
+    """
+    return np.round(base_value * np.power(decay_rate, np.arange(total_picks)), 2)
+
 def generate_draft_value_curve(
     total_picks: int = TOTAL_PICKS,
     base_value: float = 100,
@@ -29,10 +61,8 @@ def generate_draft_value_curve(
     Generate an exponential decay curve mapping pick_number -> draft pick value.
     Higher picks have higher value, decaying by decay_rate each pick.
     """
-    return {
-        i + 1: round(base_value * (decay_rate ** i), 2)
-        for i in range(total_picks)
-    }
+    curve = draft_value_curve(total_picks, base_value, decay_rate)
+    return {i + 1: float(value) for i, value in enumerate(curve)}
 
 def generate_snake_draft_order(
     team_count: int = TEAM_COUNT,
@@ -42,12 +72,15 @@ def generate_snake_draft_order(
     Generate the snake draft order as a list of team indices (0-based),
     alternating normal and reversed order each round.
     """
-    order = []
-    for rnd in range(rounds):
-        if rnd % 2 == 0:
-            order.extend(range(team_count))             # normal order
-        else:
-            order.extend(range(team_count - 1, -1, -1)) # reverse order
+    return snake_slot_matrix(team_count, rounds).ravel().tolist()
+
+def snake_slot_matrix(team_count: int = TEAM_COUNT, rounds: int = ROUNDS) -> np.ndarray:
+    """
+    Snake draft order as a (rounds, team_count) array of team indices (0-based):
+    row r lists who picks in round r + 1, reversed on every other round.
+    """
+    order = np.tile(np.arange(team_count), (rounds, 1))
+    order[1::2] = order[1::2, ::-1]
     return order
 
 def assign_picks_to_teams(
@@ -71,49 +104,169 @@ def assign_picks_to_teams(
     for pick_number, team_index in enumerate(snake_order, start=1):
         round_number = (pick_number - 1) // team_count + 1
         team_id = standings_teams[team_index]
-        picks.append(DraftPick(team_id=team_id, round_number=round_number, pick_number=pick_number))
+        picks.append(DraftPick(team_id=team_id, round_number=round_number, pick_number=pick_number, team_count=team_count))
 
     return picks
 
+def project_pick_values(
+    slot_values: np.ndarray,
+    projection: np.ndarray,
+    years: int,
+    year_discount: float = YEAR_DISCOUNT,
+    certainty: float = 1.0,
+    certainty_decay: float = CERTAINTY_DECAY
+) -> np.ndarray:
+    """
+    Expected pick values for every (year, team, round) cell at once.
+
+    slot_values[slot, round] is the value of each draft slot's pick and
+    projection[team, slot] the probability of each team drafting from each slot.
+    Each year's projection is blended toward uniform by its certainty, weighted
+    onto the slot values, and discounted by year_discount per year out.
+    """
+    team_count = slot_values.shape[0]
+    if team_count == 0:
+        return np.zeros((years, 0, slot_values.shape[1]))
+
+    uniform = np.full((team_count, team_count), 1.0 / team_count)
+    weights = certainty * np.power(certainty_decay, np.arange(years))
+    blended = weights[:, None, None] * projection[None] + (1 - weights)[:, None, None] * uniform[None]
+    discount = np.power(year_discount, np.arange(years))
+    return np.round(discount[:, None, None] * np.einsum("yts,sr->ytr", blended, slot_values), 2)
+
 class DraftPickValuator:
     """
     Class to assign and retrieve draft pick values based on standings and draft order.
+
+    Sized from the standings (any league size) and the number of rounds, and
+    covers `years` drafts starting at first_year. Values live in a precomputed
+    (year, team, round) NumPy table, so lookups are O(1). A valuator is
+    shared between callers (see get_valuator) and never changes after it is
+    built. Picks are valued by their original draft slot; which team holds
+    a traded pick is not tracked.
+
+    Future drafts are discounted by year_discount per year out, and a team's
+    draft slot is blended toward a uniform slot distribution as the projection
+    gets less certain: certainty for the next draft, scaled by certainty_decay
+    for each year after it. slot_probabilities (team x slot, rows in standings
+    order) replaces the current standings as the next draft's projection.
     """
 
     def __init__(
         self,
         standings_team_ids: List[int],
         base_value: float = 100,
-        decay_rate: float = 0.975
+        decay_rate: float = 0.975,
+        rounds: int = ROUNDS,
+        years: int = 1,
+        first_year: Optional[int] = None,
+        year_discount: float = YEAR_DISCOUNT,
+        certainty: float = 1.0,
+        certainty_decay: float = CERTAINTY_DECAY,
+        slot_probabilities: Optional[np.ndarray] = None
     ):
-        # Create pick value map: overall pick number -> value
-        self.pick_value_map = generate_draft_value_curve(TOTAL_PICKS, base_value, decay_rate)
+        self.team_ids = list(standings_team_ids)  # worst-to-best
+        self.team_count = len(self.team_ids)
+        self.rounds = rounds
+        self.years = max(1, years)
+        self.first_year = first_year
+        self.slot_of = {team_id: slot for slot, team_id in enumerate(self.team_ids)}
+
+        # Overall pick number -> value, as long as this league's draft
+        self.curve = draft_value_curve(self.team_count * rounds, base_value, decay_rate)
+        self.pick_value_map = {i + 1: float(value) for i, value in enumerate(self.curve)}
+
+        # pick_numbers[slot, round - 1]: overall pick number of each draft slot in each round
+        order = snake_slot_matrix(self.team_count, rounds)
+        self.pick_numbers = np.empty((self.team_count, rounds), dtype=np.int64)
+        self.pick_numbers[order, np.arange(rounds)[:, None]] = np.arange(1, self.team_count * rounds + 1).reshape(rounds, self.team_count)
+        slot_values = self.curve[self.pick_numbers - 1] if self.team_count else np.zeros((0, rounds))
 
-        # Map (team_id, round_number) -> list of DraftPick objects (usually one pick)
-        self.picks_by_team_round: Dict[Tuple[int, int], List[DraftPick]] = {}
+        # year_values[year, team, round - 1], teams in standings order
+        projection = np.eye(self.team_count) if slot_probabilities is None else np.asarray(slot_probabilities, dtype=np.float64)
+        self.year_values = project_pick_values(
+            slot_values, projection, self.years, year_discount, certainty, certainty_decay
+        )
 
-        # Map (team_id, round_number) -> max pick value for that pick
-        self.pick_lookup: Dict[Tuple[int, int], float] = {}
+        # values[team, round - 1]: the next draft
+        self.values = self.year_values[0]
 
-        # Assign picks to teams based on standings and rounds
-        for pick in assign_picks_to_teams(standings_team_ids, ROUNDS):
-            key = (pick.team_id, pick.round_number)
-            self.picks_by_team_round.setdefault(key, []).append(pick)
+        # Map (team_id, round_number) -> value of the team's own pick in the next draft
+        self.pick_lookup: Dict[Tuple[int, int], float] = {
+            (team_id, rnd + 1): float(self.values[slot, rnd])
+            for slot, team_id in enumerate(self.team_ids)
+            for rnd in range(rounds)
+        }
 
-        # Store max pick value per (team, round) for lookup
-        for key, picks in self.picks_by_team_round.items():
-            values = [self.pick_value_map.get(p.pick_number, 0) for p in picks]
-            self.pick_lookup[key] = max(values, default=0)
+    @property
+    def picks_by_team_round(self) -> Dict[Tuple[int, int], List[DraftPick]]:
+        """(team_id, round_number) -> [DraftPick] for each team's original pick in the next draft."""
+        return {
+            (team_id, rnd + 1): [DraftPick(team_id, rnd + 1, int(self.pick_numbers[slot, rnd]), self.team_count)]
+            for slot, team_id in enumerate(self.team_ids)
+            for rnd in range(self.rounds)
+        }
 
-    def get_pick_value(self, team_id: int, round_number: int) -> float:
+    def year_offset(self, year: Optional[int]) -> int:
+        """Draft year (or None for the next draft) -> index into year_values."""
+        if year is None or self.first_year is None:
+            return 0
+        return year - self.first_year
+
+    def get_pick_value(self, team_id: int, round_number: int, year: Optional[int] = None) -> float:
         """
-        Get the draft pick value for a given team and round.
+        Get the draft pick value for a given team, round and draft year.
 
         Args:
-            team_id: The ID of the team.
+            team_id: The ID of the team whose draft slot the pick is.
             round_number: The round number (1-based).
+            year: The draft year; None means the next draft.
 
         Returns:
             The float value of the draft pick, or 0 if not found.
         """
-        return self.pick_lookup.get((team_id, round_number), 0)
+        slot = self.slot_of.get(team_id)
+        offset = self.year_offset(year)
+        if slot is None or not 1 <= round_number <= self.rounds or not 0 <= offset < self.years:
+            return 0
+        return float(self.year_values[offset, slot, round_number - 1])
+
+_valuators: "OrderedDict[tuple, DraftPickValuator]" = OrderedDict()
+_VALUATOR_CACHE_SIZE = 32
+_valuators_lock = threading.Lock()
+
+def get_valuator(
+    standings_team_ids: Sequence[int],
+    base_value: float = 100,
+    decay_rate: float = 0.975,
+    rounds: int = ROUNDS,
+    years: int = 1,
+    first_year: Optional[int] = None,
+    year_discount: float = YEAR_DISCOUNT,
+    certainty: float = 1.0,
+    slot_probabilities: Optional[np.ndarray] = None
+) -> DraftPickValuator:
+    """
+    Shared DraftPickValuator for a standings order (and projection), memoized
+    on a hash of them so unchanged standings reuse the same valuator. It is
+    shared by every caller, so treat it as read-only.
+    """
+    projection_hash = None
+    if slot_probabilities is not None:
+        slot_probabilities = np.ascontiguousarray(slot_probabilities, dtype=np.float64)
+        projection_hash = hashlib.sha1(slot_probabilities.tobytes()).hexdigest()
+    key = (tuple(standings_team_ids), base_value, decay_rate, rounds, years, first_year, year_discount, certainty, projection_hash)
+
+    with _valuators_lock:
+        valuator = _valuators.get(key)
+        if valuator is None:
+            valuator = DraftPickValuator(
+                list(standings_team_ids), base_value, decay_rate, rounds, years, first_year,
+                year_discount, certainty, slot_probabilities=slot_probabilities
+            )
+            _valuators[key] = valuator
+            if len(_valuators) > _VALUATOR_CACHE_SIZE:
+                _valuators.popitem(last=False)
+        else:
+            _valuators.move_to_end(key)
+    return valuator
@@ -0,0 +1,136 @@
+"""
+Local OpenAI-compatible chat completion server for offline testing of the
+AI verdict paths (plain, streaming and batch).
+
+Usage: python fake_completion_server.py [--port 8765] [--token-delay 0.02] [--fail-every 0]
+
+Then point the app or ai_batch.py at it:
+    OPENAI_API_BASE=http://127.0.0.1:8765/v1 OPENAI_API_KEY=test streamlit run app.py
+
+--fail-every N answers every Nth request with a 429, to exercise retries.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+COMPLETIONS_PATH = "/v1/chat/completions"
+
+def fake_reply(messages) -> str:
+    """Deterministic verdict text derived from the last message."""
+    prompt = messages[-1]["content"] if messages else ""
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+    return (
+        f"Verdict {digest}: the values are close, so neither side clearly wins. "
+        "A small add from the side receiving more value would even it out."
+    )
+
+class FakeCompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            count = server.request_count
+
+        if server.fail_every and count % server.fail_every == 0:
+            self._send_json(429, {"error": {"message": "Rate limit reached (fake)", "type": "rate_limit"}}, {"Retry-After": "0"})
+            return
+
+        text = fake_reply(request.get("messages", []))
+        model = request.get("model", "fake")
+        created = int(time.time())
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in request.get("messages", []))
+        completion_tokens = len(text.split())
+
+        if not request.get("stream"):
+            time.sleep(server.token_delay * completion_tokens)
+            self._send_json(200, {
+                "id": f"chatcmpl-fake-{count}",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+            return
+
+        # Server-sent events, one chunk per word, like the real streaming API
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = text.split(" ")
+        try:
+            for i, word in enumerate(words):
+                time.sleep(server.token_delay)
+                chunk = {
+                    "id": f"chatcmpl-fake-{count}",
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": word if i == 0 else f" {word}"}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled mid-stream
+            pass
+        self.close_connection = True
+
+def start_server(port: int = 0, token_delay: float = 0.0, fail_every: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve on a background thread. Returns (server, api_base); call server.shutdown() when done."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeCompletionHandler)
+    server.daemon_threads = True
+    server.token_delay = token_delay
+    server.fail_every = fail_every
+    server.request_count = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local fake OpenAI chat completion server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds per streamed word")
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with a 429")
+    args = parser.parse_args()
+
+    server, api_base = start_server(args.port, args.token_delay, args.fail_every)
+    print(f"✅ Fake completion server listening; set OPENAI_API_BASE={api_base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SNAPSHOT_FILE = os.path.join("data", "cache", "league_snapshot.json")
+FIXTURE_FILE = os.getenv("LEAGUE_FIXTURE", os.path.join("fixtures", "league_snapshot.json"))
+SNAPSHOT_MAX_AGE = float(os.getenv("LEAGUE_SNAPSHOT_MAX_AGE", 6 * 60 * 60))  # seconds
+
+def offline_mode() -> bool:
+    """Offline fixture mode: serve the recorded snapshot and never touch ESPN."""
+    return os.getenv("LEAGUE_OFFLINE", "").lower() in {"1", "true", "yes"}
+
+@dataclass
+class SnapshotPlayer:
+    name: str
+    position: str = ""
+    playerId: Optional[int] = None
+    proTeam: str = ""
+    injuryStatus: str = ""
+    stats: dict = field(default_factory=dict)
+
+@dataclass
+class SnapshotTeam:
+    team_id: int
+    team_name: str
+    logo_url: str = ""
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    standing: int = 0
+    roster: List[SnapshotPlayer] = field(default_factory=list)
+
+    def record(self) -> Tuple[int, int, int, int]:
+        return (self.wins, self.losses, self.ties, self.standing)
+
+@dataclass
+class LeagueSnapshot:
+    """
+    A serializable copy of the parts of an espn_api League the app uses:
+    teams, rosters, standings and player stats. Exposes the same attribute
+    names (league.teams, team.roster, player.stats, ...) so it can stand in
+    for a live League anywhere in the app and the ESPN stat scrapers.
+    """
+    league_id: int
+    year: int
+    teams: List[SnapshotTeam] = field(default_factory=list)
+    fetched_at: float = 0.0
+    synced_at: float = 0.0
+
+    @classmethod
+    def from_league(cls, league) -> "LeagueSnapshot":
+        now = time.time()
+        return cls(
+            league_id=league.league_id,
+            year=league.year,
+            teams=[_snapshot_team(team) for team in league.teams],
+            fetched_at=now,
+            synced_at=now,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LeagueSnapshot":
+        teams = [
+            SnapshotTeam(**{**t, "roster": [SnapshotPlayer(**p) for p in t.get("roster", [])]})
+            for t in data.get("teams", [])
+        ]
+        return cls(**{**data, "teams": teams})
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last full build; incremental syncs don't refresh player stats, so they don't count."""
+        return time.time() - self.fetched_at
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of rosters and standings; changes whenever a sync changes either."""
+        h = hashlib.sha1()
+        for team in sorted(self.teams, key=lambda t: t.team_id):
+            h.update(repr((team.team_id, team.record(), sorted(p.name for p in team.roster))).encode("utf-8"))
+        return h.hexdigest()[:16]
+
+    def team(self, team_id) -> Optional[SnapshotTeam]:
+        return next((t for t in self.teams if t.team_id == team_id), None)
+
+    def standings(self) -> List[SnapshotTeam]:
+        return sorted(self.teams, key=lambda t: (t.standing or 999, -t.wins))
+
+    def sync_from_league(self, league) -> List[int]:
+        """
+        Apply the rosters and standings of a refreshed League in place.
+        Only teams whose record or roster changed are rebuilt; unchanged
+        players keep their stored stats. Returns the changed team ids.
+        """
+        changed = []
+        by_id = {t.team_id: t for t in self.teams}
+        for live in league.teams:
+            team = by_id.get(live.team_id)
+            if team is None:
+                self.teams.append(_snapshot_team(live))
+                changed.append(live.team_id)
+                continue
+
+            record = (live.wins, live.losses, getattr(live, "ties", 0), getattr(live, "standing", 0))
+            roster_names = [p.name for p in live.roster]
+            if record == team.record() and roster_names == [p.name for p in team.roster]:
+                continue
+
+            team.wins, team.losses, team.ties, team.standing = record
+            team.team_name = live.team_name
+            if roster_names != [p.name for p in team.roster]:
+                existing = {p.name: p for p in team.roster}
+                team.roster = [existing.get(p.name) or _snapshot_player(p) for p in live.roster]
+            changed.append(team.team_id)
+
+        self.synced_at = time.time()
+        return changed
+
+    def save(self, path=SNAPSHOT_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, default=str)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_FILE) -> Optional["LeagueSnapshot"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            if os.path.exists(path):
+                print(f"⚠️ Ignoring unreadable league snapshot {path}: {e}")
+            return None
+
+def _snapshot_player(player) -> SnapshotPlayer:
+    return SnapshotPlayer(
+        name=player.name,
+        position=getattr(player, "position", "") or "",
+        playerId=getattr(player, "playerId", None),
+        proTeam=getattr(player, "proTeam", "") or "",
+        injuryStatus=getattr(player, "injuryStatus", "") or "",
+        stats=getattr(player, "stats", None) or {},
+    )
+
+def _snapshot_team(team) -> SnapshotTeam:
+    return SnapshotTeam(
+        team_id=team.team_id,
+        team_name=team.team_name,
+        logo_url=getattr(team, "logo_url", "") or "",
+        wins=team.wins,
+        losses=team.losses,
+        ties=getattr(team, "ties", 0),
+        standing=getattr(team, "standing", 0),
+        roster=[_snapshot_player(p) for p in team.roster],
+    )
+
+# Live League objects kept per (league_id, year) so syncs can use League.refresh()
+_live_leagues: Dict[Tuple[int, int], object] = {}
+_live_lock = threading.Lock()
+
+def _fetch_live_league(league_id, year, espn_s2, swid, full=True):
+    from espn_api.baseball import League
+
+    key = (league_id, year)
+    with _live_lock:
+        league = _live_leagues.get(key)
+        if league is None or full:
+            league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
+        else:
+            # Rosters and standings only; skips the settings, draft and player map requests
+            league.refresh()
+        _live_leagues[key] = league
+    return league
+
+def load_league_fixture(path=FIXTURE_FILE) -> LeagueSnapshot:
+    snapshot = LeagueSnapshot.load(path)
+    if snapshot is None:
+        raise FileNotFoundError(f"No recorded league fixture at {path}; record one with python league_snapshot.py")
+    return snapshot
+
+def load_league_snapshot(
+    league_id: int,
+    year: int,
+    espn_s2: Optional[str] = None,
+    swid: Optional[str] = None,
+    max_age: float = SNAPSHOT_MAX_AGE,
+    path: str = SNAPSHOT_FILE
+) -> LeagueSnapshot:
+    """
+    Return a LeagueSnapshot, from disk when it is younger than max_age,
+    otherwise by building the league from ESPN and saving it.
+    In offline mode the recorded fixture is returned and the network is never used.
+    """
+    if offline_mode():
+        return load_league_fixture()
+
+    snapshot = LeagueSnapshot.load(path)
+    if (
+        snapshot is not None
+        and snapshot.league_id == league_id
+        and snapshot.year == year
+        and snapshot.age < max_age
+    ):
+        return snapshot
+
+    league = _fetch_live_league(league_id, year, espn_s2, swid, full=True)
+    snapshot = LeagueSnapshot.from_league(league)
+    snapshot.save(path)
+    return snapshot
+
+def sync_league_snapshot(
+    snapshot: LeagueSnapshot,
+    espn_s2: Optional[str] = None,
+    swid: Optional[str] = None,
+    path: str = SNAPSHOT_FILE
+) -> List[int]:
+    """
+    Incrementally refresh rosters and standings of a snapshot in place and save it.
+    Reuses the live League from the initial load when this process has one.
+    Returns the ids of teams that changed. A no-op in offline mode.
+    """
+    if offline_mode():
+        return []
+
+    league = _fetch_live_league(snapshot.league_id, snapshot.year, espn_s2, swid, full=False)
+    changed = snapshot.sync_from_league(league)
+    snapshot.save(path)
+    return changed
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Record the ESPN league as an offline fixture.")
+    parser.add_argument("--output", default=FIXTURE_FILE, help=f"fixture path (default {FIXTURE_FILE})")
+    args = parser.parse_args()
+
+    load_dotenv()
+    league = _fetch_live_league(
+        int(os.getenv("LEAGUE_ID")),
+        int(os.getenv("SEASON_YEAR") or os.getenv("YEAR")),
+        os.getenv("ESPN_S2"),
+        os.getenv("SWID"),
+    )
+    LeagueSnapshot.from_league(league).save(args.output)
+    print(f"✅ Recorded league fixture to {args.output}")
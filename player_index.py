@@ -0,0 +1,98 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+PITCHER_POSITIONS = {"SP", "RP", "P"}
+
+# Stat columns used by the dynasty value formulas, in matrix column order
+STAT_COLUMNS = ["HR", "R", "RBI", "SB", "AVG", "BB", "W", "SV", "K", "ERA", "WHIP", "IP"]
+STAT_DEFAULTS = {"ERA": 4.0, "WHIP": 1.3}
+
+# Ranking columns surfaced by get_player_ranks, in matrix column order
+RANK_COLUMNS = ["dynasty_value", "overall_rank", "pos_rank", "WAR", "OPS", "SLG", "OPS+"]
+RANK_DEFAULTS = {"overall_rank": 9999, "pos_rank": 9999}
+
+def normalize_name(name) -> str:
+    """Normalize a player name (or an object with a .name) to its index key."""
+    if hasattr(name, "name"):
+        name = name.name
+    return str(name).strip().lower()
+
+def numeric_matrix(df: pd.DataFrame, columns, defaults) -> np.ndarray:
+    matrix = np.empty((len(df), len(columns)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        if col in df.columns:
+            matrix[:, j] = pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        else:
+            matrix[:, j] = defaults.get(col, 0)
+    return matrix
+
+class PlayerIndex:
+    """
+    Hash index from normalized player name to row position, backed by
+    contiguous NumPy arrays. Built once per rankings load so lookups cost
+    O(1) instead of a boolean scan over the rankings DataFrame.
+
+    Duplicate names resolve to their first row, matching the previous
+    rankings_df[rankings_df["name"] == name].iloc[0] behaviour.
+    """
+
+    def __init__(self, names: np.ndarray, positions: np.ndarray, stats: np.ndarray, ranks: np.ndarray):
+        self.names = names
+        self.positions = positions
+        self.stats = np.ascontiguousarray(stats, dtype=np.float64)
+        self.ranks = np.ascontiguousarray(ranks, dtype=np.float64)
+        self.is_pitcher = np.isin(positions, list(PITCHER_POSITIONS))
+
+        self._rows: Dict[str, int] = {}
+        for row, name in enumerate(names):
+            self._rows.setdefault(name, row)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PlayerIndex":
+        if "name" in df.columns:
+            names = df["name"].astype(str).str.strip().str.lower().to_numpy()
+        else:
+            names = np.array([], dtype=object)
+        if "position" in df.columns:
+            positions = df["position"].astype(str).str.upper().to_numpy()
+        else:
+            positions = np.full(len(names), "", dtype=object)
+        return cls(
+            names=names,
+            positions=positions,
+            stats=numeric_matrix(df, STAT_COLUMNS, STAT_DEFAULTS),
+            ranks=numeric_matrix(df, RANK_COLUMNS, RANK_DEFAULTS),
+        )
+
+    @property
+    def values(self) -> np.ndarray:
+        """Persisted dynasty_value per row."""
+        return self.ranks[:, 0]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return normalize_name(name) in self._rows
+
+    def row_of(self, name) -> Optional[int]:
+        """Row position for a player, or None if not ranked."""
+        if not name:
+            return None
+        return self._rows.get(normalize_name(name))
+
+    def rows_of(self, names: Iterable) -> np.ndarray:
+        """Row positions for a batch of players, -1 where a player is not ranked."""
+        rows = self._rows
+        return np.fromiter(
+            (rows.get(normalize_name(n), -1) if n else -1 for n in names),
+            dtype=np.int64,
+        )
+
+    def stats_of(self, row: int) -> Dict[str, float]:
+        return dict(zip(STAT_COLUMNS, self.stats[row].tolist()))
+
+    def ranks_of(self, row: int) -> Dict[str, float]:
+        return dict(zip(RANK_COLUMNS, self.ranks[row].tolist()))
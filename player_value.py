@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
-import os
 import re
+from draft_value import TEAM_COUNT, YEAR_DISCOUNT
+from rankings_store import get_store
+from rankings_io import RANKINGS_CSV, load_rankings_frame
 
-RANKINGS_FILE = os.path.join("data", "dynasty_rankings_cleaned.csv")
+RANKINGS_FILE = RANKINGS_CSV
 
 def parse_ip(ip_str):
     """
@@ -26,41 +29,16 @@ def parse_ip(ip_str):
     return innings + outs / 3.0
 
 def load_rankings():
-    if not os.path.exists(RANKINGS_FILE):
-        print(f"⚠️ Rankings file not found at {RANKINGS_FILE}")
-        return pd.DataFrame(columns=[
-            "name", "dynasty_value", "overall_rank", "pos_rank",
-            "WAR", "OPS", "SLG", "OPS+",
-            "HR", "R", "RBI", "SB", "AVG", "BB",
-            "W", "SV", "K", "ERA", "WHIP", "IP",
-            "position"
-        ])
-    try:
-        df = pd.read_csv(RANKINGS_FILE)
-        df.fillna(0, inplace=True)
+    return load_rankings_frame()
 
-        # Normalize player names for matching
-        df["name"] = df["name"].astype(str).str.strip().str.lower()
-        df["position"] = df["position"].astype(str).str.upper()
-
-        # Parse IP column properly into decimal format
-        if "IP" in df.columns:
-            df["IP"] = df["IP"].apply(parse_ip)
-        else:
-            df["IP"] = 0.0
-
-        return df
-    except Exception as e:
-        print(f"Error loading rankings: {e}")
-        return pd.DataFrame(columns=[
-            "name", "dynasty_value", "overall_rank", "pos_rank",
-            "WAR", "OPS", "SLG", "OPS+",
-            "HR", "R", "RBI", "SB", "AVG", "BB",
-            "W", "SV", "K", "ERA", "WHIP", "IP",
-            "position"
-        ])
-
-rankings_df = load_rankings()
+def __getattr__(name):
+    # rankings_df / player_index used to be loaded at import time; they are
+    # now views of the shared, lazily loaded RankingsStore
+    if name == "rankings_df":
+        return get_store().frame
+    if name == "player_index":
+        return get_store().index
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def dynasty_value_hitter(stats: dict) -> float:
     hr = stats.get("HR", 0)
@@ -103,67 +81,56 @@ def dynasty_value_pitcher(stats: dict) -> float:
 
 def get_dynasty_value(player_name) -> float:
     """
-    Lookup player in rankings_df, extract ESPN-style stats,
-    determine position, and compute dynasty value accordingly.
+    Lookup a player's persisted dynasty_value in the rankings index.
+    load_rankings has already recomputed the column if it was stamped
+    with an older valuation version, so this is a pure lookup.
     """
-    if not player_name:
-        return 0
-    if hasattr(player_name, 'name'):
-        player_name = player_name.name
-    name = str(player_name).strip().lower()
-
-    match = rankings_df[rankings_df["name"] == name]
-    if match.empty:
+    index = get_store().index
+    row = index.row_of(player_name)
+    if row is None:
         return 0
+    return float(index.values[row])
 
-    row = match.iloc[0]
-
-    stats = {
-        # Hitters stats
-        "HR": row.get("HR", 0),
-        "R": row.get("R", 0),
-        "RBI": row.get("RBI", 0),
-        "SB": row.get("SB", 0),
-        "AVG": row.get("AVG", 0),
-        "BB": row.get("BB", 0),
-
-        # Pitchers stats
-        "W": row.get("W", 0),
-        "SV": row.get("SV", 0),
-        "K": row.get("K", 0),
-        "ERA": row.get("ERA", 4.0),
-        "WHIP": row.get("WHIP", 1.3),
-        "IP": row.get("IP", 0.0),
-    }
-
-    position = str(row.get("position", "")).upper()
-
-    pitcher_positions = {"SP", "RP", "P"}
-    if position in pitcher_positions:
-        return dynasty_value_pitcher(stats)
-    else:
-        return dynasty_value_hitter(stats)
-
-def get_simple_draft_pick_value(pick):
-    # Assuming 10 picks per round in your league
-    pick_num = (pick.round_number - 1) * 10 + 1
-    # Basic linear depreciation curve for draft picks
-    return max(1, 100 - (pick_num - 1) * 0.6)
+def get_dynasty_values(player_names) -> np.ndarray:
+    """
+    Batch version of get_dynasty_value. Returns an array aligned with
+    player_names, with 0 for players not found in the rankings.
+    """
+    index = get_store().index
+    rows = index.rows_of(player_names)
+    found = rows >= 0
+    values = np.zeros(len(rows), dtype=np.float64)
+    values[found] = index.values[rows[found]]
+    return values
+
+def simple_pick_values(round_numbers, team_count: int = TEAM_COUNT, years_out=0) -> np.ndarray:
+    """Vectorized simple pick value for arrays of round numbers and years until the draft."""
+    pick_nums = (np.asarray(round_numbers, dtype=np.float64) - 1) * team_count + 1
+    # Basic linear depreciation curve for draft picks, discounted per year out
+    values = np.maximum(1, 100 - (pick_nums - 1) * 0.6)
+    return values * np.power(YEAR_DISCOUNT, np.maximum(np.asarray(years_out, dtype=np.float64), 0))
+
+def get_simple_draft_pick_value(pick, team_count: int = TEAM_COUNT, first_year=None):
+    """
+    Simple value of a pick from its round, for a league of team_count teams.
+    Picks with a year later than first_year (the next draft) are discounted.
+    """
+    year = getattr(pick, "year", None)
+    years_out = year - first_year if year is not None and first_year is not None else 0
+    return float(simple_pick_values([pick.round_number], team_count, [years_out])[0])
 
 def get_player_ranks(name):
-    if not name:
-        return {}
-    name = str(name).strip().lower()
-    match = rankings_df[rankings_df["name"] == name]
-    if match.empty:
+    index = get_store().index
+    row = index.row_of(name)
+    if row is None:
         return {}
-    row = match.iloc[0]
+    ranks = index.ranks_of(row)
     return {
-        "Dynasty Value": float(row.get("dynasty_value", 0)),
-        "Overall Rank": int(row.get("overall_rank", 9999)),
-        "Position Rank": int(row.get("pos_rank", 9999)),
-        "WAR": float(row.get("WAR", 0)),
-        "OPS": float(row.get("OPS", 0)),
-        "SLG": float(row.get("SLG", 0)),
-        "OPS+": float(row.get("OPS+", 0)),
+        "Dynasty Value": float(ranks["dynasty_value"]),
+        "Overall Rank": int(ranks["overall_rank"]),
+        "Position Rank": int(ranks["pos_rank"]),
+        "WAR": float(ranks["WAR"]),
+        "OPS": float(ranks["OPS"]),
+        "SLG": float(ranks["SLG"]),
+        "OPS+": float(ranks["OPS+"]),
     }
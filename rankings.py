@@ -1,151 +1,155 @@
-import pandas as pd
 import os
-from scrapers.scrape_espn_stats import fetch_espn_hitter_stats, fetch_espn_pitcher_stats
-from scrapers.scrape_fangraphs_pitchers import fetch_fangraphs_pitchers
-from scrapers.scrape_fangraphs_hitters import fetch_fangraphs_hitters
-
-RANKINGS_FILE = os.path.join("data", "dynasty_rankings_cleaned.csv")
-
-def parse_ip(ip_val):
-    try:
-        ip_float = float(ip_val)
-        whole = int(ip_float)
-        fraction = round(ip_float - whole, 1)
-        if fraction == 0.1:
-            return whole + 1/3
-        elif fraction == 0.2:
-            return whole + 2/3
-        return ip_float
-    except:
-        return 0.0
+import pandas as pd
+import re
+import time
+from scrapers.orchestrator import registered_sources, run_scrapers
+from rankings_staging import STAGED_MAX_AGE, RankingsStaging
+from rankings_store import get_store
+from consensus import consensus_rankings, merge_signature
+from rankings_io import RANKINGS_CSV, SOURCE_COLUMNS, load_rankings_frame, normalize_rankings, parse_ip, read_digest, write_rankings
+from player_index import STAT_DEFAULTS
+from valuation import dynasty_values
+
+RANKINGS_FILE = RANKINGS_CSV
+
+def clean_player_name(name):
+    """
+    Normalize a roster name to the form the scrapers store in the rankings:
+    lowercase, no parenthesised team info, no generational suffix.
+    """
+    if not isinstance(name, str):
+        return ""
+    name = re.sub(r"\s*\(.*\)", "", name)
+    name = re.sub(r" Jr\.| Sr\.| III| II", "", name)
+    return name.strip().lower()
 
 def fetch_all_sources(league):
-    # Fetch ESPN hitters
-    try:
-        hitters_espn = fetch_espn_hitter_stats(league)
-    except Exception as e:
-        print(f"Error fetching ESPN hitters: {e}")
-        hitters_espn = pd.DataFrame()
-
-    # Fetch ESPN pitchers
-    try:
-        pitchers_espn = fetch_espn_pitcher_stats(league)
-    except Exception as e:
-        print(f"Error fetching ESPN pitchers: {e}")
-        pitchers_espn = pd.DataFrame()
-
-    if pitchers_espn is not None and "IP" in pitchers_espn.columns:
-        pitchers_espn["IP"] = pitchers_espn["IP"].apply(parse_ip)
-
-    # Fetch Fangraphs hitters
-    try:
-        hitters_fg = fetch_fangraphs_hitters()
-    except Exception as e:
-        print(f"Error fetching Fangraphs hitters: {e}")
-        hitters_fg = pd.DataFrame()
-
-    # Fetch Fangraphs pitchers
-    try:
-        pitchers_fg = fetch_fangraphs_pitchers()
-    except Exception as e:
-        print(f"Error fetching Fangraphs pitchers: {e}")
-        pitchers_fg = pd.DataFrame()
-
-    if pitchers_fg is not None and "IP" in pitchers_fg.columns:
-        pitchers_fg["IP"] = pitchers_fg["IP"].apply(parse_ip)
-
-    return [hitters_espn, pitchers_espn, hitters_fg, pitchers_fg]
-
-def combine_rankings(dfs):
     """
-    Combine multiple DataFrames of player rankings/stats into a single cleaned DataFrame.
+    Fetch every registered source concurrently (see scrapers.orchestrator).
+    Returns a dict of source name -> DataFrame in registration order, empty for sources that failed.
     """
+    results = run_scrapers(league)
 
-    # Filter out empty or None DataFrames
-    valid_dfs = [df for df in dfs if df is not None and not df.empty]
+    for df in results.values():
+        if df is not None and "IP" in df.columns:
+            df["IP"] = df["IP"].apply(parse_ip)
 
-    if not valid_dfs:
-        return pd.DataFrame()  # Return empty DataFrame if no valid data
+    return results
 
-    # Concatenate all valid DataFrames
-    combined = pd.concat(valid_dfs, ignore_index=True, sort=False)
+def prepare_source(df):
+    """
+    Clean one source's DataFrame and value every row, in the rankings schema.
+    Rows only depend on their own source, so sources can be prepared independently.
+    """
+    df = df.copy()
 
     # Clean player names
-    combined["name"] = combined["name"].astype(str).str.strip().str.lower()
+    df["name"] = df["name"].astype(str).str.strip().str.lower()
 
     # Normalize position strings to uppercase and fill missing with empty string
-    combined["position"] = combined.get("position", "").astype(str).str.upper().fillna("")
-
-    # Parse IP for pitchers if exists
-    if "IP" in combined.columns:
-        combined["IP"] = combined["IP"].apply(parse_ip)
-
-    # Fill missing numeric values with 0
-    combined.fillna(0, inplace=True)
-
-    # Calculate dynasty_value for each row
-    def calc_dyn_val(row):
-        pos = row.get("position", "")
-        if pos in {"SP", "RP", "P"}:
-            return dynasty_value_pitcher(row)
-        else:
-            return dynasty_value_hitter(row)
-
-    combined["dynasty_value"] = combined.apply(calc_dyn_val, axis=1)
-
-    # Ensure default ranks exist
-    if "overall_rank" not in combined.columns:
-        combined["overall_rank"] = 9999
-    if "pos_rank" not in combined.columns:
-        combined["pos_rank"] = 9999
-
-    # Define expected columns and add missing with zeros
-    expected_cols = [
-        "name", "dynasty_value", "overall_rank", "pos_rank", "position",
-        "WAR", "OPS", "SLG", "OPS+",
-        "HR", "R", "RBI", "SB", "AVG", "BB",
-        "W", "SV", "K", "ERA", "WHIP", "IP"
-    ]
-    for col in expected_cols:
-        if col not in combined.columns:
-            combined[col] = 0
-
-    # Return combined DataFrame with columns in expected order
-    combined = combined[expected_cols].copy()
-
-    # Save combined rankings to file
-    combined.to_csv(RANKINGS_FILE, index=False)
+    df["position"] = df["position"].fillna("").astype(str).str.upper() if "position" in df.columns else ""
+
+    # IP is already decimal innings (fetch_all_sources parses it)
+    # Calculate dynasty_value for every row at once, from this source's own
+    # stats (stats it doesn't report take the formula defaults)
+    df["dynasty_value"] = dynasty_values(df.fillna(STAT_DEFAULTS))
+
+    # Ranks the source doesn't give are stored as 0; stats it doesn't report stay NaN
+    return normalize_rankings(df, parse_innings=False, columns=SOURCE_COLUMNS, keep_missing=True)
+
+def _publish(combined, force=False):
+    # Save combined rankings (Arrow + CSV export), stamped with the valuation version;
+    # skipped when the canonical output's digest matches what is on disk
+    combined, written = write_rankings(combined, force=force)
+    if not written:
+        print(f"✅ Rankings content unchanged (digest {read_digest(RANKINGS_CSV)[:12]}), nothing written")
+        return combined
+
+    # Hot-swap the new rankings into any process that is already serving them
+    get_store().reload()
 
     return combined
 
+def combine_rankings(dfs, staging=None, force=False):
+    """
+    Combine multiple DataFrames of player rankings/stats into a single cleaned
+    DataFrame with one consensus row per player (see consensus.py).
+
+    dfs is a dict of source name -> frame, as fetch_all_sources returns; the
+    names pick each source's merge weight and mark prospect lists. Sources go
+    through the per-source staging area: the rankings are only rebuilt and
+    rewritten when some source's content changed (or force is set), and
+    sources that came back empty keep their last staged rows.
+    """
+    if not isinstance(dfs, dict):
+        raise TypeError("combine_rankings takes a dict of source name -> DataFrame")
+    return _combine_staged(dfs, staging or RankingsStaging(), force)
+
+def _combine_staged(dfs, staging, force):
+    prepared = {}
+    changed = []
+    for name, df in dfs.items():
+        if df is None or df.empty:
+            if name in staging.sources:
+                age = time.time() - staging.sources[name]["fetched_at"]
+                if age <= STAGED_MAX_AGE:
+                    print(f"⚠️ {name} returned no rows, keeping its rankings from {age / 3600:.0f}h ago")
+            continue
+        prepared[name] = prepare_source(df)
+        if staging.stage(name, prepared[name]):
+            changed.append(name)
+
+    # Stale sources, and sources neither registered nor passed in, leave the rankings;
+    # dropping one changes the combined hash. Passing a subset of the registered
+    # sources keeps the others' staged rows.
+    known = {s.name for s in registered_sources()} | set(dfs)
+    for name in staging.prune(known):
+        print(f"⚠️ Dropped staged rankings for {name} (stale or no longer registered)")
+        changed.append(name)
+
+    if not staging.sources:
+        return pd.DataFrame()
+
+    # The rankings depend on every staged source and on the merge rules
+    build_hash = f"{merge_signature()}:{staging.combined_hash()}"
+    if not force and not changed and staging.manifest.get("combined_hash") == build_hash \
+            and os.path.exists(RANKINGS_CSV):
+        staging.save_manifest()  # fetch times only
+        print("✅ No source changed since the last refresh; rankings left as is")
+        return get_store().frame
+
+    # Freshly prepared sources are used directly; the rest are read back from staging.
+    # Registration order first, since it sets source priority in the merge
+    frames = {}
+    for name in [n for n in dfs if n in staging.sources] + [n for n in staging.sources if n not in dfs]:
+        if name in prepared:
+            frames[name] = prepared[name]
+            continue
+        try:
+            frames[name] = staging.load(name)
+        except Exception as e:
+            print(f"⚠️ Dropping unreadable staged source {name}: {e}")
+            del staging.sources[name]
+    if not frames:
+        return pd.DataFrame()
+
+    combined = _publish(consensus_rankings(frames), force)
+    staging.manifest["combined_hash"] = f"{merge_signature()}:{staging.combined_hash()}"
+    staging.save_manifest()
+    print(f"✅ Rankings rebuilt from {len(frames)} sources ({', '.join(changed) or 'none'} changed)")
+    return combined
+
 def load_rankings():
-    if not os.path.exists(RANKINGS_FILE):
-        print(f"⚠️ Rankings file not found at {RANKINGS_FILE}")
-        return pd.DataFrame(columns=[
-            "name", "dynasty_value", "overall_rank", "pos_rank",
-            "WAR", "OPS", "SLG", "OPS+",
-            "HR", "R", "RBI", "SB", "AVG", "BB",
-            "W", "SV", "K", "ERA", "WHIP", "IP",
-            "position"
-        ])
-    try:
-        df = pd.read_csv(RANKINGS_FILE)
-        df.fillna(0, inplace=True)
-        df["name"] = df["name"].astype(str).str.strip().str.lower()
-        df["position"] = df["position"].astype(str).str.upper()
-        df["IP"] = df["IP"].apply(parse_ip)
-        return df
-    except Exception as e:
-        print(f"Error loading rankings: {e}")
-        return pd.DataFrame(columns=[
-            "name", "dynasty_value", "overall_rank", "pos_rank",
-            "WAR", "OPS", "SLG", "OPS+",
-            "HR", "R", "RBI", "SB", "AVG", "BB",
-            "W", "SV", "K", "ERA", "WHIP", "IP",
-            "position"
-        ])
-
-rankings_df = load_rankings()
+    return load_rankings_frame()
+
+def __getattr__(name):
+    # rankings_df / player_index used to be loaded at import time; they are
+    # now views of the shared, lazily loaded RankingsStore
+    if name == "rankings_df":
+        return get_store().frame
+    if name == "player_index":
+        return get_store().index
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def dynasty_value_hitter(stats):
     return round(
@@ -175,58 +179,29 @@ def dynasty_value_pitcher(stats):
     )
 
 def get_dynasty_value(player_name):
-    if not player_name:
-        return 0
-    if hasattr(player_name, 'name'):
-        player_name = player_name.name
-
-    name = str(player_name).strip().lower()
-    match = rankings_df[rankings_df["name"] == name]
-    if match.empty:
+    index = get_store().index
+    row = index.row_of(player_name)
+    if row is None:
         return 0
-
-    row = match.iloc[0]
-
-    stats = {
-        "HR": row.get("HR", 0),
-        "R": row.get("R", 0),
-        "RBI": row.get("RBI", 0),
-        "SB": row.get("SB", 0),
-        "AVG": row.get("AVG", 0),
-        "BB": row.get("BB", 0),
-        "W": row.get("W", 0),
-        "SV": row.get("SV", 0),
-        "K": row.get("K", 0),
-        "ERA": row.get("ERA", 4.0),
-        "WHIP": row.get("WHIP", 1.3),
-        "IP": parse_ip(row.get("IP", 0))
-    }
-
-    position = str(row.get("position", "")).upper()
-    if position in {"SP", "RP", "P"}:
-        return dynasty_value_pitcher(stats)
-    else:
-        return dynasty_value_hitter(stats)
+    return float(index.values[row])
 
 def get_simple_draft_pick_value(pick):
     pick_num = (pick.round_number - 1) * 10 + 1
     return max(1, 100 - (pick_num - 1) * 0.6)
 
 def get_player_ranks(name):
-    if not name:
-        return {}
-    name = str(name).strip().lower()
-    match = rankings_df[rankings_df["name"] == name]
-    if match.empty:
+    index = get_store().index
+    row = index.row_of(name)
+    if row is None:
         return {}
 
-    row = match.iloc[0]
+    ranks = index.ranks_of(row)
     return {
-        "Dynasty Value": float(row.get("dynasty_value", 0)),
-        "Overall Rank": int(row.get("overall_rank", 9999)),
-        "Position Rank": int(row.get("pos_rank", 9999)),
-        "WAR": float(row.get("WAR", 0)),
-        "OPS": float(row.get("OPS", 0)),
-        "SLG": float(row.get("SLG", 0)),
-        "OPS+": float(row.get("OPS+", 0)),
+        "Dynasty Value": float(ranks["dynasty_value"]),
+        "Overall Rank": int(ranks["overall_rank"]),
+        "Position Rank": int(ranks["pos_rank"]),
+        "WAR": float(ranks["WAR"]),
+        "OPS": float(ranks["OPS"]),
+        "SLG": float(ranks["SLG"]),
+        "OPS+": float(ranks["OPS+"]),
     }
@@ -0,0 +1,234 @@
+import functools
+import hashlib
+import os
+import threading
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from valuation import ensure_current_values, read_metadata, valuation_metadata, write_metadata
+
+RANKINGS_CSV = os.path.join("data", "dynasty_rankings_cleaned.csv")
+RANKINGS_ARROW = os.path.join("data", "dynasty_rankings_cleaned.arrow")
+
+STRING_COLUMNS = ["name", "position"]
+INT_COLUMNS = ["overall_rank", "pos_rank", "rank_min", "rank_max", "source_count"]
+FLOAT_COLUMNS = [
+    "dynasty_value",
+    "WAR", "OPS", "SLG", "OPS+",
+    "HR", "R", "RBI", "SB", "AVG", "BB",
+    "W", "SV", "K", "ERA", "WHIP", "IP",
+    "rank_mean", "rank_median",
+]
+FLOAT_DECIMALS = 6  # canonical precision of stored floats; hides arithmetic noise
+
+# One source's rows, as scraped and valued (see rankings.prepare_source)
+SOURCE_COLUMNS = [
+    "name", "dynasty_value", "overall_rank", "pos_rank", "position",
+    "WAR", "OPS", "SLG", "OPS+",
+    "HR", "R", "RBI", "SB", "AVG", "BB",
+    "W", "SV", "K", "ERA", "WHIP", "IP"
+]
+# Stats a source may not report; kept as NaN in staged source frames
+SOURCE_STAT_COLUMNS = [c for c in SOURCE_COLUMNS if c in FLOAT_COLUMNS and c != "dynasty_value"]
+# Cross-source rank summary added by the consensus merge (see consensus.py)
+CONSENSUS_COLUMNS = ["rank_mean", "rank_median", "rank_min", "rank_max", "source_count"]
+RANKINGS_COLUMNS = SOURCE_COLUMNS + CONSENSUS_COLUMNS
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """Import pyarrow on first use; None means CSV-only storage."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        return pa
+    except ImportError:
+        return None
+
+def arrow_available() -> bool:
+    return _pyarrow() is not None
+
+@functools.lru_cache(maxsize=None)
+def rankings_schema(columns=tuple(RANKINGS_COLUMNS)):
+    pa = _pyarrow()
+    return pa.schema(
+        [(c, pa.string()) if c in STRING_COLUMNS
+         else (c, pa.int64()) if c in INT_COLUMNS
+         else (c, pa.float64())
+         for c in columns]
+    )
+
+def parse_ip(ip_val):
+    """Innings as decimal innings (180.1 -> 180.333); NaN when missing or unparseable."""
+    if pd.isna(ip_val):
+        return float("nan")
+    try:
+        ip_float = float(ip_val)
+        whole = int(ip_float)
+        fraction = round(ip_float - whole, 1)
+        if fraction == 0.1:
+            return whole + 1/3
+        elif fraction == 0.2:
+            return whole + 2/3
+        return ip_float
+    except (TypeError, ValueError, OverflowError):
+        return float("nan")
+
+def empty_rankings() -> pd.DataFrame:
+    return normalize_rankings(pd.DataFrame(columns=RANKINGS_COLUMNS))
+
+def normalize_rankings(df: pd.DataFrame, parse_innings=True, columns=RANKINGS_COLUMNS, keep_missing=False) -> pd.DataFrame:
+    """
+    Coerce a rankings frame to the fixed storage schema: normalized names and
+    positions, decimal IP, typed numeric columns, columns in schema order.
+    Pass columns=SOURCE_COLUMNS for a single source's rows. With keep_missing,
+    stats that aren't reported stay NaN instead of 0 (see SOURCE_STAT_COLUMNS).
+    """
+    df = df.copy()
+    missing = SOURCE_STAT_COLUMNS if keep_missing else []
+    for col in columns:
+        if col not in df.columns:
+            df[col] = "" if col in STRING_COLUMNS else float("nan") if col in missing else 0
+
+    df["name"] = df["name"].fillna("").astype(str).str.strip().str.lower()
+    df["position"] = df["position"].fillna("").astype(str).str.upper()
+    if parse_innings:
+        df["IP"] = df["IP"].apply(parse_ip)
+    for col in INT_COLUMNS:
+        if col in columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64")
+    for col in FLOAT_COLUMNS:
+        if col in columns:
+            values = pd.to_numeric(df[col], errors="coerce").astype("float64")
+            df[col] = values if col in missing else values.fillna(0)
+
+    return df[list(columns)].reset_index(drop=True)
+
+def canonical_rankings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rankings in canonical form: storage schema, floats rounded to
+    FLOAT_DECIMALS (no negative zero), rows sorted by name. The sort is
+    stable, so duplicate names keep their source order.
+    """
+    df = normalize_rankings(df, parse_innings=False)
+    df[FLOAT_COLUMNS] = df[FLOAT_COLUMNS].round(FLOAT_DECIMALS) + 0.0
+    return df.sort_values("name", kind="mergesort", ignore_index=True)
+
+def digest_path(csv_path) -> str:
+    return os.path.splitext(csv_path)[0] + ".sha256"
+
+def read_digest(csv_path) -> Optional[str]:
+    try:
+        with open(digest_path(csv_path), "r", encoding="utf-8") as f:
+            return f.read().split()[0]
+    except (OSError, IndexError):
+        return None
+
+def write_rankings(df: pd.DataFrame, arrow_path=RANKINGS_ARROW, csv_path=RANKINGS_CSV, force=False) -> Tuple[pd.DataFrame, bool]:
+    """
+    Persist rankings as an uncompressed Arrow IPC file (memory-mappable) plus
+    the CSV export, and stamp them with the valuation version.
+    The frame is expected to have IP already parsed to decimal innings.
+
+    The output is canonical (see canonical_rankings) and its CSV bytes are
+    hashed into a sha256sum-style sidecar. When the digest, the valuation
+    stamp and the files are all unchanged nothing is written.
+    Returns (canonical frame, whether anything was written).
+    """
+    df = canonical_rankings(df)
+    body = df.to_csv(index=False, lineterminator="\n").encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()
+
+    unchanged = (
+        not force
+        and read_digest(csv_path) == digest
+        and read_metadata(csv_path).get("valuation_version") == valuation_metadata()["valuation_version"]
+        and os.path.exists(csv_path)
+        and (_pyarrow() is None or os.path.exists(arrow_path))
+    )
+    if unchanged:
+        return df, False
+
+    if _pyarrow() is not None:
+        write_arrow_file(df, arrow_path)
+
+    tmp_path = f"{csv_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, csv_path)
+    write_metadata(csv_path)
+
+    # Written last, so an interrupted write never looks up to date
+    with open(digest_path(csv_path), "w", encoding="utf-8") as f:
+        f.write(f"{digest}  {os.path.basename(csv_path)}\n")
+    return df, True
+
+def write_arrow_file(df: pd.DataFrame, arrow_path):
+    """Write a schema-normalized rankings (or source) frame as an uncompressed Arrow IPC file, atomically."""
+    pa = _pyarrow()
+    schema = rankings_schema(tuple(df.columns))
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    tmp_path = f"{arrow_path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+    # Atomic swap, so readers holding the old memory map are unaffected
+    os.replace(tmp_path, arrow_path)
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+def read_rankings_table(arrow_path=RANKINGS_ARROW):
+    """
+    Memory-map the Arrow rankings file. Tables are cached per file version,
+    so every reader in the process shares the same mapped buffers.
+    """
+    key = (os.path.abspath(arrow_path), os.stat(arrow_path).st_mtime_ns)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            pa = _pyarrow()
+            source = pa.memory_map(arrow_path, "r")
+            table = pa.ipc.open_file(source).read_all()
+            _tables.clear()
+            _tables[key] = table
+    return table
+
+def read_arrow_file(arrow_path) -> pd.DataFrame:
+    """Read an Arrow rankings file without going through the shared table cache."""
+    pa = _pyarrow()
+    with pa.OSFile(arrow_path, "rb") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+def read_rankings_file(path) -> pd.DataFrame:
+    """
+    Read a rankings file in either storage format (.arrow or .csv),
+    normalized to the storage schema. Raises on unreadable files.
+    """
+    if path.endswith(".arrow"):
+        if _pyarrow() is None:
+            raise ImportError("pyarrow is required to read Arrow rankings files")
+        # Numeric columns without nulls are handed to pandas without copying
+        return read_rankings_table(path).to_pandas(split_blocks=True)
+    return normalize_rankings(pd.read_csv(path))
+
+def load_rankings_frame(arrow_path=RANKINGS_ARROW, csv_path=RANKINGS_CSV) -> pd.DataFrame:
+    """
+    Load the current rankings, preferring the memory-mapped Arrow file and
+    falling back to parsing the CSV export. Stale dynasty values are recomputed.
+    Returns an empty schema-shaped frame if neither file can be read.
+    """
+    if os.path.exists(arrow_path) and _pyarrow() is not None:
+        path = arrow_path
+    elif os.path.exists(csv_path):
+        path = csv_path
+    else:
+        print(f"⚠️ Rankings file not found at {arrow_path} or {csv_path}")
+        return empty_rankings()
+
+    try:
+        df = read_rankings_file(path)
+    except Exception as e:
+        print(f"Error loading rankings from {path}: {e}")
+        return empty_rankings()
+    return ensure_current_values(df, csv_path)
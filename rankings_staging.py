@@ -0,0 +1,140 @@
+"""
+Per-source staging for incremental rankings refreshes.
+
+Each source's prepared frame (cleaned, valued, in the rankings schema) is
+kept under data/staging/ with a manifest recording its content hash, when
+it was last fetched and when its content last changed. A refresh hashes
+every source it fetched, but only rewrites a source's staged file, and only
+rebuilds the combined rankings, when some source's hash moved.
+
+A source that comes back empty (site down, layout change) keeps its last
+staged frame, so one failed scrape does not drop it from the rankings, but
+only for STAGED_MAX_AGE; after that, and as soon as a source is no longer
+registered, its staged rows are dropped.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from rankings_io import SOURCE_COLUMNS, arrow_available, normalize_rankings, read_arrow_file, write_arrow_file
+from valuation import valuation_metadata
+
+STAGING_DIR = os.path.join("data", "staging")
+MANIFEST_FILE = "manifest.json"
+STAGING_FORMAT = 2  # 2: unreported stats are NaN rather than 0
+STAGED_MAX_AGE = float(os.getenv("STAGED_MAX_AGE", 7 * 24 * 60 * 60))  # seconds since a source last fetched
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Content hash of a frame's columns and values (row order matters, the index does not)."""
+    h = hashlib.sha1()
+    h.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+class RankingsStaging:
+    def __init__(self, directory: str = STAGING_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+        # Staged values are only reusable under the valuation formula (and file format) that produced them
+        version = valuation_metadata()["valuation_version"]
+        if self.manifest.get("valuation_version") != version or self.manifest.get("format") != STAGING_FORMAT:
+            if self.manifest.get("sources"):
+                print(
+                    f"⚠️ Staged sources were valued with {self.manifest.get('valuation_version')} "
+                    f"(format {self.manifest.get('format', 1)}), restaging all"
+                )
+            self.manifest = {"valuation_version": version, "format": STAGING_FORMAT, "sources": {}}
+
+    @property
+    def sources(self) -> Dict[str, dict]:
+        return self.manifest["sources"]
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.arrow" if arrow_available() else f"{name}.csv")
+
+    def stage(self, name: str, prepared: pd.DataFrame, fetched_at: Optional[float] = None) -> bool:
+        """
+        Store a source's prepared frame if its content changed.
+        Returns True when the staged content changed (or is new).
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        prepared = normalize_rankings(prepared, parse_innings=False, columns=SOURCE_COLUMNS, keep_missing=True)
+        digest = frame_hash(prepared)
+
+        with self._lock:
+            entry = self.sources.get(name)
+            if entry is not None and entry["hash"] == digest and os.path.exists(entry["file"]):
+                entry["fetched_at"] = fetched_at
+                return False
+
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(name)
+            if path.endswith(".arrow"):
+                write_arrow_file(prepared, path)
+            else:
+                prepared.to_csv(path, index=False)
+            self.sources[name] = {
+                "hash": digest,
+                "rows": int(len(prepared)),
+                "file": path,
+                "fetched_at": fetched_at,
+                "changed_at": fetched_at,
+            }
+            return True
+
+    def load(self, name: str) -> pd.DataFrame:
+        path = self.sources[name]["file"]
+        if path.endswith(".arrow"):
+            return read_arrow_file(path)
+        return normalize_rankings(pd.read_csv(path), parse_innings=False, columns=SOURCE_COLUMNS, keep_missing=True)
+
+    def prune(self, registered: Iterable[str], max_age: float = STAGED_MAX_AGE, now: Optional[float] = None) -> List[str]:
+        """
+        Drop staged sources whose names aren't in `registered` (the sources the
+        caller still knows about), or that haven't fetched successfully within
+        max_age seconds. Returns the dropped names.
+        """
+        now = time.time() if now is None else now
+        registered = set(registered)
+        with self._lock:
+            dropped = [
+                name for name, entry in self.sources.items()
+                if name not in registered or now - entry.get("fetched_at", 0) > max_age
+            ]
+            for name in dropped:
+                entry = self.sources.pop(name)
+                try:
+                    os.remove(entry["file"])
+                except OSError:
+                    pass
+        return dropped
+
+    def combined_hash(self) -> str:
+        """Digest of every staged source's hash, in staging order."""
+        h = hashlib.sha1()
+        for name, entry in self.sources.items():
+            h.update(f"{name}:{entry['hash']};".encode("utf-8"))
+        return h.hexdigest()
+
@@ -0,0 +1,85 @@
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+from player_index import PlayerIndex
+from rankings_io import load_rankings_frame
+
+@dataclass(frozen=True)
+class RankingsSnapshot:
+    """
+    An immutable view of one version of the rankings: the frame, its index,
+    and a generation number that changes every time a new version is published.
+    """
+    frame: pd.DataFrame
+    index: PlayerIndex
+    version: int
+
+class RankingsStore:
+    """
+    Process-wide rankings holder shared by rankings.py, player_value.py and app.py.
+
+    Loads lazily on first access. reload() builds the new snapshot off to the
+    side and publishes it with a single reference swap, so readers always see
+    either the old or the new rankings, never a mix.
+    """
+
+    def __init__(self, loader=load_rankings_frame):
+        self._loader = loader
+        self._snapshot: Optional[RankingsSnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> RankingsSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._publish(self._loader())
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self.snapshot().frame
+
+    @property
+    def index(self) -> PlayerIndex:
+        return self.snapshot().index
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def reload(self, force=False) -> Optional[RankingsSnapshot]:
+        """
+        Re-read the rankings from disk and hot-swap them in. Does nothing if
+        the store was never loaded, unless force is set.
+        """
+        if not (force or self.loaded):
+            return None
+        df = self._loader()
+        with self._lock:
+            return self._publish(df)
+
+    def _publish(self, df: pd.DataFrame) -> RankingsSnapshot:
+        self._generation += 1
+        self._snapshot = RankingsSnapshot(frame=df, index=PlayerIndex.from_frame(df), version=self._generation)
+        return self._snapshot
+
+_store: Optional[RankingsStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> RankingsStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RankingsStore()
+    return _store
@@ -0,0 +1,68 @@
+from typing import Dict, Iterable
+
+import numpy as np
+
+from player_index import PlayerIndex
+from rankings import clean_player_name
+
+# One entry per rostered player
+ROSTER_DTYPE = np.dtype([("player", object), ("dynasty_value", np.float64), ("position", object)])
+
+class LeagueValuationTable:
+    """
+    Dynasty value of every rostered player in the league, computed once per
+    league sync and rankings version: team_id -> structured array of
+    (player, dynasty_value, position).
+
+    Trade values become sums over cached entries, and per-team total and
+    positional value come for free instead of revaluing whole rosters.
+    """
+
+    def __init__(self, league, index: PlayerIndex):
+        self.tables: Dict[int, np.ndarray] = {}
+        self._slots: Dict[int, Dict[str, int]] = {}
+
+        for team in league.teams:
+            names = [p.name for p in team.roster]
+            rows = index.rows_of([clean_player_name(name) for name in names])
+            values = np.zeros(len(rows), dtype=np.float64)
+            found = rows >= 0
+            values[found] = index.values[rows[found]]
+
+            table = np.empty(len(names), dtype=ROSTER_DTYPE)
+            table["player"] = names
+            table["dynasty_value"] = values
+            table["position"] = [getattr(p, "position", "") or "" for p in team.roster]
+
+            self.tables[team.team_id] = table
+            self._slots[team.team_id] = {name: i for i, name in enumerate(names)}
+
+    def team_table(self, team_id) -> np.ndarray:
+        return self.tables.get(team_id, np.empty(0, dtype=ROSTER_DTYPE))
+
+    def player_value(self, team_id, player_name) -> float:
+        slot = self._slots.get(team_id, {}).get(player_name)
+        return 0.0 if slot is None else float(self.tables[team_id]["dynasty_value"][slot])
+
+    def players_value(self, team_id, player_names: Iterable[str]) -> float:
+        """Summed dynasty value of the named players on a team's roster."""
+        slots = self._slots.get(team_id, {})
+        picked = [slots[name] for name in player_names if name in slots]
+        if not picked:
+            return 0.0
+        return float(self.tables[team_id]["dynasty_value"][picked].sum())
+
+    def team_total(self, team_id) -> float:
+        return float(self.team_table(team_id)["dynasty_value"].sum())
+
+    def positional_value(self, team_id) -> Dict[str, float]:
+        """Summed dynasty value per roster position for a team."""
+        table = self.team_table(team_id)
+        if len(table) == 0:
+            return {}
+        positions, inverse = np.unique(table["position"].astype(str), return_inverse=True)
+        totals = np.bincount(inverse, weights=table["dynasty_value"], minlength=len(positions))
+        return dict(zip(positions.tolist(), totals.tolist()))
+
+    def team_totals(self) -> Dict[int, float]:
+        return {team_id: self.team_total(team_id) for team_id in self.tables}
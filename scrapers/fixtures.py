@@ -0,0 +1,201 @@
+"""
+Recorded HTTP fixtures for running the scrapers offline.
+
+capture: every response that http_client.fetch returns is also saved under
+         the fixture directory, keyed by URL.
+replay:  fetch never touches the live sites. Requests are rewritten to a
+         local HTTP server that serves the saved responses, so the whole
+         session / parse / normalize path still runs; unknown URLs get a 404.
+
+Turn a mode on with SCRAPER_FIXTURES=capture|replay (and optionally
+SCRAPER_FIXTURE_DIR), or with set_mode() in code.
+
+Usage: python -m scrapers.fixtures capture            # run every scraper live and record
+       python -m scrapers.fixtures serve [--port 8766] # serve the corpus for manual runs
+       python -m scrapers.fixtures add URL page.html   # save a page by hand
+       python -m scrapers.fixtures list
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+FIXTURE_DIR = os.getenv("SCRAPER_FIXTURE_DIR", os.path.join("fixtures", "http"))
+INDEX_FILE = "index.json"
+MODES = ("capture", "replay")
+
+def fixture_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+class FixtureStore:
+    """URL -> saved response (status, headers, encoding, body file) in one directory."""
+
+    def __init__(self, directory: str = FIXTURE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.index: Dict[str, dict] = self._load_index()
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def save(self, url: str, body: bytes, status: int = 200, content_type: str = "text/html", encoding: Optional[str] = None):
+        key = fixture_key(url)
+        os.makedirs(self.directory, exist_ok=True)
+        body_path = os.path.join(self.directory, f"{key}.body")
+        tmp_body = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_body, "wb") as f:
+            f.write(body)
+        os.replace(tmp_body, body_path)
+        with self._lock:
+            self.index[url] = {
+                "key": key,
+                "status": status,
+                "content_type": content_type,
+                "encoding": encoding,
+                "bytes": len(body),
+                "recorded_at": time.time(),
+            }
+            self._write_index()
+
+    def lookup_key(self, key: str) -> Tuple[Optional[dict], Optional[bytes]]:
+        for entry in self.index.values():
+            if entry["key"] == key:
+                try:
+                    with open(os.path.join(self.directory, f"{key}.body"), "rb") as f:
+                        return entry, f.read()
+                except OSError:
+                    return None, None
+        return None, None
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        key = self.path.strip("/").split("/")[-1]
+        entry, body = self.server.store.lookup_key(key)
+        if entry is None:
+            body = b"No fixture recorded for this URL"
+            entry = {"status": 404, "content_type": "text/plain", "encoding": None}
+        content_type = entry.get("content_type") or "text/html"
+        if entry.get("encoding") and "charset" not in content_type:
+            content_type = f"{content_type}; charset={entry['encoding']}"
+        self.send_response(entry["status"])
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_replay_server(store: FixtureStore, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve a store on a background thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _ReplayHandler)
+    server.daemon_threads = True
+    server.store = store
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+class FixtureSession:
+    """The active fixture mode, consulted by http_client.fetch."""
+
+    def __init__(self, mode: str, directory: str = FIXTURE_DIR):
+        if mode not in MODES:
+            raise ValueError(f"Unknown fixture mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.store = FixtureStore(directory)
+        self.server = None
+        self.base_url = None
+        self.fetch_seconds = 0.0  # time spent inside fetch, for the scraper benchmarks
+        self.misses = []
+        self._lock = threading.Lock()
+
+    def replay_url(self, url: str) -> str:
+        with self._lock:
+            if self.server is None:
+                self.server, self.base_url = start_replay_server(self.store)
+        if url not in self.store.index:
+            self.misses.append(url)
+        return f"{self.base_url}/r/{fixture_key(url)}"
+
+    def record(self, url: str, response):
+        content_type = response.headers.get("Content-Type", "text/html").split(";")[0].strip()
+        self.store.save(url, response.content, response.status_code, content_type, response.encoding)
+
+    def add_time(self, seconds: float):
+        with self._lock:
+            self.fetch_seconds += seconds
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+
+_active: Optional[FixtureSession] = None
+
+def set_mode(mode: Optional[str], directory: str = FIXTURE_DIR) -> Optional[FixtureSession]:
+    """Switch fixtures to capture or replay (None turns them off). Returns the new session."""
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = FixtureSession(mode, directory) if mode else None
+    return _active
+
+def active() -> Optional[FixtureSession]:
+    return _active
+
+if os.getenv("SCRAPER_FIXTURES"):
+    set_mode(os.getenv("SCRAPER_FIXTURES"))
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record and replay scraper HTTP fixtures.")
+    parser.add_argument("command", choices=["capture", "serve", "add", "list"])
+    parser.add_argument("args", nargs="*", help="add: URL and a saved HTML file")
+    parser.add_argument("--dir", default=FIXTURE_DIR, help=f"fixture directory (default {FIXTURE_DIR})")
+    parser.add_argument("--port", type=int, default=8766)
+    options = parser.parse_args()
+
+    if options.command == "capture":
+        from scrapers.orchestrator import run_scrapers
+        session = set_mode("capture", options.dir)
+        results = run_scrapers()
+        for name, df in results.items():
+            print(f"{'✅' if not df.empty else '⚠️'} {name}: {len(df)} rows")
+        print(f"✅ Recorded {len(session.store.index)} responses to {options.dir}")
+    elif options.command == "serve":
+        store = FixtureStore(options.dir)
+        server, base_url = start_replay_server(store, options.port)
+        print(f"✅ Serving {len(store.index)} fixtures at {base_url}/r/<key>")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif options.command == "add":
+        if len(options.args) != 2:
+            parser.error("add takes a URL and a file")
+        url, path = options.args
+        with open(path, "rb") as f:
+            FixtureStore(options.dir).save(url, f.read(), encoding="utf-8")
+        print(f"✅ Saved {path} as the fixture for {url}")
+    else:
+        store = FixtureStore(options.dir)
+        for url, entry in sorted(store.index.items()):
+            print(f"{entry['status']}  {entry['bytes']:>9,}  {url}")
+        print(f"{len(store.index)} fixtures in {options.dir}")
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from scrapers import fixtures
+
+CACHE_DIR = os.path.join("data", "cache", "http")
+CACHE_TTL = float(os.getenv("SCRAPER_CACHE_TTL", 6 * 60 * 60))  # serve without revalidating
+CACHE_MAX_AGE = 7 * 24 * 60 * 60  # evict entries untouched for a week
+DEFAULT_TIMEOUT = 15
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; FantasyTradeAnalyzer/1.0)"
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide pooled Session shared by every scraper,
+    with keep-alive connection reuse and retry/backoff on transient errors.
+    Once the retries run out, the last error response is returned rather
+    than raised, so callers can check its status code.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=["GET"],
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def _cache_paths(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json"), os.path.join(CACHE_DIR, f"{key}.body")
+
+def _read_cache(url):
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        return meta, body
+    except (OSError, ValueError):
+        return None, None
+
+def _write_cache(url, meta, body=None):
+    meta_path, body_path = _cache_paths(url)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write to temp files then rename so concurrent readers never see partial entries
+    if body is not None:
+        tmp_body = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_body, "wb") as f:
+            f.write(body)
+        os.replace(tmp_body, body_path)
+    tmp_meta = f"{meta_path}.{threading.get_ident()}.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+
+def _cached_response(url, meta, body) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response.reason = "OK"
+    response._content = body
+    response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    response.encoding = meta.get("encoding")
+    response.from_cache = True
+    return response
+
+def fetch(url, headers=None, timeout=DEFAULT_TIMEOUT, ttl=CACHE_TTL, use_cache=True) -> requests.Response:
+    """
+    GET a URL through the shared session and on-disk response cache.
+
+    Entries younger than ttl are served without touching the network. Older
+    entries are revalidated with If-None-Match / If-Modified-Since, and a 304
+    serves the cached body. Error responses are returned as-is and never cached.
+
+    With scraper fixtures in replay mode the request goes to the local replay
+    server instead; in capture mode every response is also recorded.
+    """
+    recording = fixtures.active()
+    if recording is None:
+        return _fetch(url, headers, timeout, ttl, use_cache)
+
+    started = time.perf_counter()
+    try:
+        if recording.mode == "replay":
+            response = get_session().get(recording.replay_url(url), headers=headers, timeout=timeout)
+            response.from_cache = False
+            return response
+        response = _fetch(url, headers, timeout, ttl, use_cache)
+        recording.record(url, response)
+        return response
+    finally:
+        recording.add_time(time.perf_counter() - started)
+
+def _fetch(url, headers, timeout, ttl, use_cache) -> requests.Response:
+    session = get_session()
+    if not use_cache:
+        return session.get(url, headers=headers, timeout=timeout)
+
+    meta, body = _read_cache(url)
+    if meta is not None and time.time() - meta.get("fetched_at", 0) < ttl:
+        return _cached_response(url, meta, body)
+
+    request_headers = dict(headers or {})
+    if meta is not None:
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = session.get(url, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and meta is not None:
+        meta["fetched_at"] = time.time()
+        _write_cache(url, meta)
+        return _cached_response(url, meta, body)
+
+    response.from_cache = False
+    if response.status_code == 200:
+        _write_cache(url, {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+        }, response.content)
+    return response
+
+def prune_cache(max_age=CACHE_MAX_AGE) -> int:
+    """
+    Evict cache entries that have not been fetched or revalidated within max_age seconds.
+    Returns the number of entries removed.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    removed = 0
+    now = time.time()
+    for filename in os.listdir(CACHE_DIR):
+        if not filename.endswith(".json"):
+            continue
+        meta_path = os.path.join(CACHE_DIR, filename)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                fetched_at = json.load(f).get("fetched_at", 0)
+        except (OSError, ValueError):
+            fetched_at = 0
+        if now - fetched_at > max_age:
+            for path in (meta_path, meta_path[:-len(".json")] + ".body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            removed += 1
+    return removed
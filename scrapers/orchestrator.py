@@ -0,0 +1,131 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Default knobs for a full refresh
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 2
+REFRESH_DEADLINE = 120.0  # seconds for the whole refresh, not per source
+
+@dataclass
+class ScraperSource:
+    """
+    A registered rankings/stats source.
+
+    name: Short identifier used in logs and results.
+    fetch: The scraper's fetch_* function.
+    host: Remote host the fetch hits (None for sources that read the league object).
+    needs_league: Whether fetch takes the ESPN league as its only argument.
+    """
+    name: str
+    fetch: Callable[..., pd.DataFrame]
+    host: Optional[str] = None
+    needs_league: bool = False
+
+_REGISTRY: Dict[str, ScraperSource] = {}
+
+def register_source(name, fetch, host=None, needs_league=False) -> ScraperSource:
+    source = ScraperSource(name=name, fetch=fetch, host=host, needs_league=needs_league)
+    _REGISTRY[name] = source
+    return source
+
+def registered_sources() -> List[ScraperSource]:
+    if not _REGISTRY:
+        _register_default_sources()
+    return list(_REGISTRY.values())
+
+def _register_default_sources():
+    # Imported here so the scrapers are only loaded when a refresh actually runs
+    from scrapers.scrape_espn_stats import fetch_espn_hitter_stats, fetch_espn_pitcher_stats
+    from scrapers.scrape_fangraphs_hitters import fetch_fangraphs_hitters
+    from scrapers.scrape_fangraphs_pitchers import fetch_fangraphs_pitchers
+    from scrapers.scrape_fantasypros import fetch_fantasypros_hitters, fetch_fantasypros_pitchers
+    from scrapers.scrape_cbssports import fetch_cbssports_rankings
+    from scrapers.scrape_fantrax import fetch_fantraxhq_rankings
+    from scrapers.scrape_pitcherlist import fetch_pitcherlist_dynasty_rankings
+    from scrapers.scrape_rotoballer import fetch_rotoballer_rankings
+    from scrapers.scrape_rotowire import fetch_rotowire_rankings
+    from scrapers.scrape_prospectslive import fetch_prospectslive_rankings
+    from scrapers.scrape_mlb_pipeline import fetch_mlbpipeline_prospects
+
+    register_source("espn_hitters", fetch_espn_hitter_stats, needs_league=True)
+    register_source("espn_pitchers", fetch_espn_pitcher_stats, needs_league=True)
+    register_source("fangraphs_hitters", fetch_fangraphs_hitters, host="www.fangraphs.com")
+    register_source("fangraphs_pitchers", fetch_fangraphs_pitchers, host="www.fangraphs.com")
+    register_source("fantasypros_hitters", fetch_fantasypros_hitters, host="www.fantasypros.com")
+    register_source("fantasypros_pitchers", fetch_fantasypros_pitchers, host="www.fantasypros.com")
+    register_source("cbssports", fetch_cbssports_rankings, host="www.cbssports.com")
+    register_source("fantraxhq", fetch_fantraxhq_rankings, host="www.fantraxhq.com")
+    register_source("pitcherlist", fetch_pitcherlist_dynasty_rankings, host="www.pitcherlist.com")
+    register_source("rotoballer", fetch_rotoballer_rankings, host="www.rotoballer.com")
+    register_source("rotowire", fetch_rotowire_rankings, host="www.rotowire.com")
+    register_source("prospectslive", fetch_prospectslive_rankings, host="www.prospectslive.com")
+    register_source("mlb_pipeline", fetch_mlbpipeline_prospects, host="www.mlb.com")
+
+def run_scrapers(
+    league=None,
+    sources: Optional[List[ScraperSource]] = None,
+    max_workers: int = MAX_WORKERS,
+    per_host_limit: int = PER_HOST_LIMIT,
+    deadline: float = REFRESH_DEADLINE
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run every registered source concurrently on a bounded thread pool.
+
+    At most per_host_limit fetches hit the same host at once. Sources that
+    fail, or that have not finished when the deadline expires, yield an empty
+    DataFrame so the refresh takes about as long as the slowest source.
+
+    Returns:
+        Dict of source name -> DataFrame, in registration order.
+    """
+    from scrapers.http_client import prune_cache
+    prune_cache()
+
+    if sources is None:
+        sources = registered_sources()
+    if league is None:
+        sources = [s for s in sources if not s.needs_league]
+
+    host_limits = {
+        host: threading.BoundedSemaphore(per_host_limit)
+        for host in {s.host for s in sources if s.host}
+    }
+
+    def run_one(source: ScraperSource) -> pd.DataFrame:
+        limit = host_limits.get(source.host)
+        if limit is not None:
+            limit.acquire()
+        try:
+            started = time.perf_counter()
+            df = source.fetch(league) if source.needs_league else source.fetch()
+            print(f"⏱️ {source.name} finished in {time.perf_counter() - started:.2f}s")
+            return df if df is not None else pd.DataFrame()
+        finally:
+            if limit is not None:
+                limit.release()
+
+    results = {s.name: pd.DataFrame() for s in sources}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scraper")
+    try:
+        futures = {executor.submit(run_one, s): s for s in sources}
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            source = futures[future]
+            try:
+                results[source.name] = future.result()
+            except Exception as e:
+                print(f"Error fetching {source.name}: {e}")
+
+        for future in not_done:
+            print(f"⚠️ {futures[future].name} missed the {deadline:.0f}s refresh deadline, skipping")
+    finally:
+        # Don't block on stragglers; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
@@ -1,6 +1,6 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from scrapers.http_client import fetch
+from scrapers.table_extract import read_tables
 import re
 
 CBS_URL = "https://www.cbssports.com/fantasy/baseball/rankings/dynasty/"
@@ -17,28 +17,21 @@ def clean_name(name):
 def fetch_cbssports_rankings():
     print("Fetching CBS Sports dynasty rankings...")
     try:
-        response = requests.get(CBS_URL, headers=HEADERS)
+        response = fetch(CBS_URL, headers=HEADERS)
         response.raise_for_status()
     except Exception as e:
         print(f"❌ Failed to fetch CBS rankings: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Find all tables with player data (CBS sometimes splits by position)
-    tables = soup.find_all("table")
+    # All tables with player data (CBS sometimes splits by position)
+    tables = read_tables(response.text, header="Player")
     if not tables:
-        print("❌ No tables found on CBS rankings page")
+        print("❌ No player tables found on CBS rankings page")
         return pd.DataFrame()
 
     dfs = []
-    for table in tables:
+    for df in tables:
         try:
-            # Use flavor='html5lib' to avoid lxml dependency
-            df = pd.read_html(str(table), flavor='html5lib')[0]
-            if "Player" not in df.columns:
-                continue
-
             rename_map = {
                 "Player": "name",
                 "Rank": "overall_rank",
@@ -1,12 +1,16 @@
-from espn_api.baseball import League
+from typing import TYPE_CHECKING
 import pandas as pd
 
+if TYPE_CHECKING:
+    # Only for annotations; a recorded LeagueSnapshot works in place of a League
+    from espn_api.baseball import League
+
 def clean_name(name: str) -> str:
     if not isinstance(name, str):
         return ""
     return name.lower().strip()
 
-def fetch_espn_hitter_stats(league: League) -> pd.DataFrame:
+def fetch_espn_hitter_stats(league: "League") -> pd.DataFrame:
     hitters = []
     for team in league.teams:
         for player in team.roster:
@@ -25,7 +29,7 @@ def fetch_espn_hitter_stats(league: League) -> pd.DataFrame:
             })
     return pd.DataFrame(hitters)
 
-def fetch_espn_pitcher_stats(league: League) -> pd.DataFrame:
+def fetch_espn_pitcher_stats(league: "League") -> pd.DataFrame:
     pitchers = []
     for team in league.teams:
         for player in team.roster:
@@ -1,5 +1,5 @@
-import requests
-from bs4 import BeautifulSoup
+from scrapers.http_client import fetch
+from scrapers.table_extract import iter_tables
 import pandas as pd
 import re
 
@@ -12,44 +12,37 @@ def clean_name(name):
 
 def fetch_fangraphs_pitchers():
     headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(URL, headers=headers)
+    response = fetch(URL, headers=headers)
     if response.status_code != 200:
         print(f"Failed to fetch {URL} (status {response.status_code})")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table", id="LeaderBoard1_dg1_ctl") or soup.find("table")
-    if not table:
+    # The ratings grid, or failing that the first table on the page
+    table = None
+    for candidate in iter_tables(response.text, prefer_links=True, typed=False):
+        if candidate.attrs.get("id") == "LeaderBoard1_dg1_ctl":
+            table = candidate
+            break
+        if table is None:
+            table = candidate
+    if table is None:
         print("Could not find pitcher ratings table on FanGraphs page")
         return pd.DataFrame()
 
-    thead = table.find("thead")
-    if not thead:
-        print("No <thead> found in table")
+    if not table.headers:
+        print("No header row found in table")
         return pd.DataFrame()
 
-    headers_row = [th.get_text(strip=True).lower() for th in thead.find_all("th")]
+    headers_row = [h.lower() for h in table.headers]
+    player_cols = [i for i, h in enumerate(headers_row) if i == 1 or "player" in h]
 
     rows = []
-    tbody = table.find("tbody")
-    if not tbody:
-        print("No <tbody> found in table")
-        return pd.DataFrame()
-
-    for tr in tbody.find_all("tr"):
-        cells = tr.find_all("td")
-        if not cells or len(cells) != len(headers_row):
+    for cells in table.rows:
+        if len(cells) != len(headers_row):
             continue
-        row_data = {}
-        for i, cell in enumerate(cells):
-            text = cell.get_text(strip=True)
-            if i == 1 or "player" in headers_row[i]:
-                a = cell.find("a")
-                if a:
-                    text = a.get_text(strip=True)
-                text = clean_name(text)
-            row_data[headers_row[i]] = text
-        rows.append(row_data)
+        for i in player_cols:
+            cells[i] = clean_name(cells[i])
+        rows.append(dict(zip(headers_row, cells)))
 
     df = pd.DataFrame(rows)
     col_map = {
@@ -1,6 +1,6 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from scrapers.http_client import fetch
+from scrapers.table_extract import find_table
 import re
 import time
 
@@ -16,18 +16,16 @@ def clean_name(name):
     return name.strip().lower()
 
 def scrape_fantasypros_table(url):
-    response = requests.get(url, headers=HEADERS)
+    response = fetch(url, headers=HEADERS)
     if response.status_code != 200:
         raise ValueError(f"Failed to fetch {url} (status {response.status_code})")
 
-    soup = BeautifulSoup(response.content, "html.parser")
-    table = soup.find("table", {"id": "data"})
-    if not table:
+    # Parsing stops once the rankings table has been read
+    table = find_table(response.text, table_id="data")
+    if table is None:
         raise ValueError(f"Could not find rankings table on {url}")
 
-    # Use flavor='html5lib' to avoid lxml dependency
-    df = pd.read_html(str(table), flavor='html5lib')[0]
-    return df
+    return table.to_frame()
 
 def find_pos_rank_column(df):
     # Look for a column header containing "pos rank" or similar, case-insensitive
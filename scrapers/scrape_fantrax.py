@@ -1,6 +1,6 @@
-import requests
+from scrapers.http_client import fetch
+from scrapers.table_extract import iter_tables
 import pandas as pd
-from bs4 import BeautifulSoup
 import re
 
 BASE_URL = "https://www.fantraxhq.com/category/mlb/mlb-dynasty-rankings/"
@@ -15,20 +15,29 @@ def clean_player_name(name):
     name = re.sub(r" Jr\.| Sr\.| III| II", "", name)
     return name.strip().lower()
 
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def _to_float(value):
+    try:
+        return float(value) if value not in (None, "") else 0
+    except (TypeError, ValueError):
+        return 0
+
 def fetch_fantraxhq_rankings():
     try:
-        resp = requests.get(BASE_URL, headers=HEADERS, timeout=10)
+        resp = fetch(BASE_URL, headers=HEADERS)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        tables = soup.find_all("table")
+        tables = list(iter_tables(resp.text))
         if not tables:
             raise RuntimeError("FantraxHQ rankings tables not found")
 
         all_data = []
         for table in tables:
-            headers = [th.get_text(strip=True).lower() for th in table.find_all("th")]
-            rows = table.find_all("tr")[1:]  # skip header row
+            headers = [str(h).lower() for h in table.headers]
 
             # Try to detect positional rank column index (optional)
             pos_rank_idx = None
@@ -39,25 +48,17 @@ def fetch_fantraxhq_rankings():
 
             stat_cols = ["hr", "r", "rbi", "sb", "bb", "avg", "w", "sv", "k", "era", "whip"]
 
-            for row in rows:
-                cells = row.find_all("td")
+            for cells in table.rows:
                 if len(cells) < 3:
                     continue
 
-                try:
-                    rank = int(cells[0].text.strip())
-                except:
-                    rank = 0
-
-                player_name = clean_player_name(cells[1].text.strip())
-                position = cells[2].text.strip() if len(cells) > 2 else ""
+                rank = _to_int(cells[0])
+                player_name = clean_player_name(cells[1])
+                position = str(cells[2]) if cells[2] is not None else ""
 
                 # Positional rank if available
                 if pos_rank_idx is not None and len(cells) > pos_rank_idx:
-                    try:
-                        pos_rank = int(cells[pos_rank_idx].text.strip())
-                    except:
-                        pos_rank = 0
+                    pos_rank = _to_int(cells[pos_rank_idx])
                 else:
                     pos_rank = 0
 
@@ -72,11 +73,7 @@ def fetch_fantraxhq_rankings():
                     if pos_rank_idx is not None and col_idx >= pos_rank_idx:
                         col_idx += 1
                     if len(cells) > col_idx:
-                        try:
-                            val = cells[col_idx].text.strip()
-                            stats[stat_col.upper()] = float(val) if val else 0
-                        except:
-                            stats[stat_col.upper()] = 0
+                        stats[stat_col.upper()] = _to_float(cells[col_idx])
 
                 all_data.append({
                     "name": player_name,
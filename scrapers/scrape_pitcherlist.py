@@ -1,4 +1,5 @@
-import requests
+from scrapers.http_client import fetch
+from scrapers.table_extract import iter_tables
 import pandas as pd
 from bs4 import BeautifulSoup
 import re
@@ -18,7 +19,7 @@ def clean_player_name(name):
 
 def get_article_urls(category_url):
     """Scrape the category page to get recent article URLs."""
-    resp = requests.get(category_url, headers=HEADERS)
+    resp = fetch(category_url, headers=HEADERS)
     resp.raise_for_status()
     soup = BeautifulSoup(resp.text, "html.parser")
 
@@ -29,48 +30,40 @@ def get_article_urls(category_url):
 
 def scrape_rankings_from_article(article_url):
     """Extract player rankings from a single article page."""
-    resp = requests.get(article_url, headers=HEADERS)
+    resp = fetch(article_url, headers=HEADERS)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
 
     data = []
-    
+    found_table = False
+
     # Look for tables in the article content
-    tables = soup.select("article table")
-    if not tables:
-        # Sometimes rankings might be in lists or other formats — add custom logic if needed
-        print(f"⚠️ No tables found in article {article_url}")
-        return pd.DataFrame()
+    for table in iter_tables(resp.text, within="article"):
+        found_table = True
 
-    for table in tables:
-        try:
-            df = pd.read_html(str(table))[0]
-        except Exception as e:
-            print(f"⚠️ Failed to parse a table in {article_url}: {e}")
-            continue
-        
         # Try to identify columns with player info
         # Common columns: Rank, Player, Position, Team, etc.
         # Normalize column names to lowercase
-        df.columns = [str(c).strip().lower() for c in df.columns]
+        columns = [str(c).strip().lower() for c in table.headers]
 
         # Find likely columns
-        rank_col = next((c for c in df.columns if "rank" in c), None)
-        player_col = next((c for c in df.columns if "player" in c or "name" in c), None)
-        pos_col = next((c for c in df.columns if "pos" in c or "position" in c), None)
+        rank_idx = next((i for i, c in enumerate(columns) if "rank" in c), None)
+        player_idx = next((i for i, c in enumerate(columns) if "player" in c or "name" in c), None)
+        pos_idx = next((i for i, c in enumerate(columns) if "pos" in c or "position" in c), None)
 
-        if not player_col or not rank_col:
+        if player_idx is None or rank_idx is None:
             print(f"⚠️ Table missing rank or player column in {article_url}, skipping.")
             continue
 
         # Build data rows
-        for _, row in df.iterrows():
+        for row in table.rows:
+            if len(row) <= max(rank_idx, player_idx):
+                continue
             try:
-                rank = int(row[rank_col])
-            except:
+                rank = int(row[rank_idx])
+            except (TypeError, ValueError):
                 rank = 0
-            player_name = clean_player_name(str(row[player_col]))
-            position = str(row[pos_col]) if pos_col in df.columns else ""
+            player_name = clean_player_name(str(row[player_idx]))
+            position = str(row[pos_idx]) if pos_idx is not None and pos_idx < len(row) and row[pos_idx] is not None else ""
 
             data.append({
                 "name": player_name,
@@ -85,6 +78,11 @@ def scrape_rankings_from_article(article_url):
                 "dynasty_value": 0
             })
 
+    if not found_table:
+        # Sometimes rankings might be in lists or other formats — add custom logic if needed
+        print(f"⚠️ No tables found in article {article_url}")
+        return pd.DataFrame()
+
     if not data:
         return pd.DataFrame()
     return pd.DataFrame(data)
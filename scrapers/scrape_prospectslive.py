@@ -1,4 +1,4 @@
-import requests
+from scrapers.http_client import fetch
 import pandas as pd
 from bs4 import BeautifulSoup
 import re
@@ -17,7 +17,7 @@ def clean_player_name(name):
 
 def fetch_prospectslive_rankings():
     try:
-        resp = requests.get(BASE_URL, headers=HEADERS, timeout=10)
+        resp = fetch(BASE_URL, headers=HEADERS)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, "html.parser")
 
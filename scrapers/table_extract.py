@@ -0,0 +1,255 @@
+"""
+Single-pass HTML table extraction.
+
+A streaming html.parser subclass that keeps only the tables it is reading,
+never a DOM of the whole page, and hands each table back as soon as its
+</table> is seen, with cell text already converted to int / float / str.
+This replaces parsing a page with BeautifulSoup, re-serializing one table
+with str(table) and parsing it again with pd.read_html.
+
+    table = find_table(response.text, table_id="data")
+    df = table.to_frame()
+"""
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+CHUNK_SIZE = 64 * 1024  # characters fed to the parser between checks for finished tables
+
+_NUMBER = re.compile(r"[-+]?(?:\d[\d,]*\.?\d*|\.\d+)")
+_SKIP_TAGS = {"script", "style", "template"}
+
+def convert_cell(text: str):
+    """Cell text -> int, float, None (empty) or the stripped string, like read_html's inference."""
+    if not text:
+        return None
+    if _NUMBER.fullmatch(text):
+        number = text.replace(",", "")
+        try:
+            return float(number) if "." in number else int(number)
+        except ValueError:
+            return text
+    return text
+
+@dataclass
+class Table:
+    index: int  # position among the page's tables (or those inside `within`), in document order
+    attrs: Dict[str, str]
+    headers: List[str] = field(default_factory=list)
+    rows: List[list] = field(default_factory=list)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Rows as a DataFrame; short rows are padded and long rows cut to the header width."""
+        width = len(self.headers) or max((len(row) for row in self.rows), default=0)
+        columns = self.headers or list(range(width))
+        rows = [row[:width] + [None] * (width - len(row)) for row in self.rows]
+        return pd.DataFrame(rows, columns=columns)
+
+class _Cell:
+    __slots__ = ("parts", "link", "header", "span")
+
+    def __init__(self, header, span):
+        self.parts: List[str] = []
+        self.link: Optional[List[str]] = None
+        self.header = header
+        self.span = span
+
+class _TableState:
+    __slots__ = ("table", "section", "row", "row_is_header", "cell", "header_rows", "in_link")
+
+    def __init__(self, table):
+        self.table = table
+        self.section = None  # thead / tbody / tfoot
+        self.row: Optional[list] = None
+        self.row_is_header = True
+        self.cell: Optional[_Cell] = None
+        self.header_rows: List[List[str]] = []
+        self.in_link = False
+
+class TableExtractor(HTMLParser):
+    """
+    Feed HTML in chunks and collect finished tables from `done`.
+
+    within: only count tables nested inside this tag (e.g. "article").
+    prefer_links: use the text of a cell's first <a> when it has one.
+    typed: convert cell text with convert_cell; otherwise keep strings.
+    """
+
+    def __init__(self, within: Optional[str] = None, prefer_links: bool = False, typed: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.within = within
+        self.within_depth = 0 if within else 1
+        self.prefer_links = prefer_links
+        self.typed = typed
+        self.stack: List[_TableState] = []
+        self.done: List[Table] = []
+        self.count = 0
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if tag == self.within:
+            self.within_depth += 1
+            return
+        if tag == "table":
+            if self.within_depth > 0:
+                self.stack.append(_TableState(Table(self.count, dict(attrs))))
+                self.count += 1
+            return
+        if not self.stack:
+            return
+
+        state = self.stack[-1]
+        if tag in ("td", "th"):
+            self._close_cell(state)
+            if state.row is None:
+                self._open_row(state)
+            try:
+                span = max(1, int(dict(attrs).get("colspan") or 1))
+            except ValueError:
+                span = 1
+            state.cell = _Cell(tag == "th", span)
+        elif tag == "tr":
+            self._close_row(state)
+            self._open_row(state)
+        elif tag in ("thead", "tbody", "tfoot"):
+            self._close_row(state)
+            state.section = tag
+        elif tag == "a" and state.cell is not None and state.cell.link is None:
+            state.cell.link = []
+            state.in_link = True
+        elif tag == "br" and state.cell is not None:
+            state.cell.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if tag == self.within:
+            self.within_depth = max(0, self.within_depth - 1)
+            return
+        if not self.stack:
+            return
+
+        state = self.stack[-1]
+        if tag == "table":
+            self._close_row(state)
+            self.stack.pop()
+            self._finish(state)
+        elif tag in ("td", "th"):
+            self._close_cell(state)
+        elif tag == "tr":
+            self._close_row(state)
+        elif tag in ("thead", "tbody", "tfoot"):
+            self._close_row(state)
+            state.section = None
+        elif tag == "a":
+            state.in_link = False
+
+    def handle_data(self, data):
+        if self.skip_depth or not self.stack:
+            return
+        state = self.stack[-1]
+        cell = state.cell
+        if cell is None:
+            return
+        cell.parts.append(data)
+        if state.in_link:
+            cell.link.append(data)
+
+    def close(self):
+        super().close()
+        # Unterminated tables at end of input still count
+        while self.stack:
+            state = self.stack.pop()
+            self._close_row(state)
+            self._finish(state)
+
+    def _open_row(self, state):
+        state.row = []
+        state.row_is_header = True
+
+    def _close_cell(self, state):
+        cell = state.cell
+        if cell is None:
+            return
+        state.cell = None
+        state.in_link = False
+        parts = cell.link if self.prefer_links and cell.link else cell.parts
+        text = " ".join("".join(parts).split())
+        state.row_is_header = state.row_is_header and cell.header
+        state.row.extend([text] * cell.span)
+
+    def _close_row(self, state):
+        self._close_cell(state)
+        row = state.row
+        state.row = None
+        if not row:
+            return
+        table = state.table
+        # Header rows: anything in <thead>, or all-<th> rows before the first data row
+        if state.section == "thead" or (state.row_is_header and not table.rows and state.section != "tfoot"):
+            state.header_rows.append(row)
+        elif self.typed:
+            table.rows.append([convert_cell(text) for text in row])
+        else:
+            table.rows.append(row)
+
+    def _finish(self, state):
+        if state.header_rows:
+            # Like read_html with a single header row; stacked header rows keep the last
+            state.table.headers = state.header_rows[-1]
+        self.done.append(state.table)
+
+def iter_tables(
+    source: Union[str, bytes],
+    within: Optional[str] = None,
+    prefer_links: bool = False,
+    typed: bool = True,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[Table]:
+    """
+    Yield each table in the page as soon as it has been parsed, in closing order.
+    Stopping the iteration early stops parsing the rest of the page.
+    """
+    if isinstance(source, bytes):
+        source = source.decode("utf-8", errors="replace")
+    parser = TableExtractor(within=within, prefer_links=prefer_links, typed=typed)
+    for start in range(0, len(source), chunk_size):
+        parser.feed(source[start:start + chunk_size])
+        while parser.done:
+            yield parser.done.pop(0)
+    parser.close()
+    yield from parser.done
+
+def find_table(
+    source: Union[str, bytes],
+    table_id: Optional[str] = None,
+    header: Optional[str] = None,
+    index: Optional[int] = None,
+    **options
+) -> Optional[Table]:
+    """
+    First table matching every given criterion, or None:
+    its id attribute, a column header (exact match) or its position on the page.
+    With no criteria, the first table.
+    """
+    for table in iter_tables(source, **options):
+        if table_id is not None and table.attrs.get("id") != table_id:
+            continue
+        if header is not None and header not in table.headers:
+            continue
+        if index is not None and table.index != index:
+            continue
+        return table
+    return None
+
+def read_tables(source: Union[str, bytes], header: Optional[str] = None, **options) -> List[pd.DataFrame]:
+    """Every table (with the given column header, if any) as a DataFrame, in document order."""
+    tables = [t for t in iter_tables(source, **options) if header is None or header in t.headers]
+    return [t.to_frame() for t in sorted(tables, key=lambda t: t.index)]
@@ -0,0 +1,181 @@
+"""
+Monte Carlo rest-of-season standings simulation.
+
+Each team's per-game win probability comes from its roster dynasty value
+relative to the league, every simulation draws all teams' remaining results
+at once with NumPy, and the final standings give each team a probability of
+drafting from each slot. Those slot probabilities feed DraftPickValuator in
+place of the current standings, which are noisy early in the season.
+
+Simulations are split into chunks with independent SeedSequence streams and
+run on a process pool, so results are reproducible for a given seed.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+CACHE_DIR = os.path.join("data", "cache", "standings_sim")
+SIMULATIONS = 20_000
+CHUNK_SIZE = 5_000
+REMAINING_GAMES = int(os.getenv("SIM_REMAINING_GAMES", 100))  # category results left per team
+STRENGTH_SCALE = 0.35  # logit of win probability per standard deviation of roster value
+SIM_BUDGET = 20.0  # seconds
+
+@dataclass
+class StandingsProjection:
+    team_ids: List[int]
+    slot_probabilities: np.ndarray  # [team, slot], slot 0 = first pick (worst finish)
+    simulations: int
+    complete: bool = True
+
+    @property
+    def expected_slot(self) -> np.ndarray:
+        return self.slot_probabilities @ np.arange(self.slot_probabilities.shape[1])
+
+    def valuator_inputs(self):
+        """(standings_team_ids worst-to-best by expected slot, slot probabilities in that order)."""
+        order = np.argsort(self.expected_slot, kind="stable")
+        return [self.team_ids[i] for i in order], self.slot_probabilities[order]
+
+    def to_dict(self) -> dict:
+        return {
+            "team_ids": self.team_ids,
+            "slot_probabilities": self.slot_probabilities.tolist(),
+            "simulations": self.simulations,
+            "complete": self.complete,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StandingsProjection":
+        return cls(
+            team_ids=list(data["team_ids"]),
+            slot_probabilities=np.asarray(data["slot_probabilities"], dtype=np.float64),
+            simulations=int(data["simulations"]),
+            complete=bool(data.get("complete", True)),
+        )
+
+def win_probabilities(roster_values: np.ndarray, scale: float = STRENGTH_SCALE) -> np.ndarray:
+    """Per-game win probability against an average opponent, from standardized roster value."""
+    values = np.asarray(roster_values, dtype=np.float64)
+    spread = values.std()
+    z = (values - values.mean()) / spread if spread > 0 else np.zeros_like(values)
+    return 1.0 / (1.0 + np.exp(-scale * z))
+
+def simulate_slot_counts(
+    wins: np.ndarray,
+    losses: np.ndarray,
+    win_prob: np.ndarray,
+    remaining: int,
+    simulations: int,
+    seed
+) -> np.ndarray:
+    """
+    Run simulations in one vectorized pass. Returns counts[team, slot] of how
+    often each team finished in each draft slot (slot 0 = worst record).
+    """
+    rng = np.random.default_rng(seed)
+    team_count = len(wins)
+    extra_wins = rng.binomial(remaining, win_prob, size=(simulations, team_count))
+    final_pct = (wins + extra_wins) / np.maximum(wins + losses + remaining, 1)
+    # Random tie-breaks, below the resolution of a single game
+    final_pct = final_pct + rng.random((simulations, team_count)) * 1e-9
+
+    # slot of each team in each simulation: rank of its final record, worst first
+    slots = np.argsort(np.argsort(final_pct, axis=1), axis=1)
+    flat = slots + np.arange(team_count)[None, :] * team_count
+    return np.bincount(flat.ravel(), minlength=team_count * team_count).reshape(team_count, team_count)
+
+def _simulate_chunk(task) -> np.ndarray:
+    """Process-pool worker; takes and returns picklable data only."""
+    wins, losses, win_prob, remaining, simulations, seed = task
+    return simulate_slot_counts(wins, losses, win_prob, remaining, simulations, seed)
+
+def _cache_key(fingerprint, team_ids, roster_values, options) -> str:
+    h = hashlib.sha1()
+    h.update(str(fingerprint).encode("utf-8"))
+    h.update(json.dumps([list(map(int, team_ids)), options], sort_keys=True).encode("utf-8"))
+    h.update(np.asarray(roster_values, dtype=np.float64).tobytes())
+    return h.hexdigest()[:20]
+
+def simulate_standings(
+    teams: Sequence,
+    roster_values: Dict[int, float],
+    simulations: int = SIMULATIONS,
+    remaining: int = REMAINING_GAMES,
+    seed: int = 0,
+    time_budget: float = SIM_BUDGET,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    fingerprint: Optional[str] = None,
+    cache_dir: str = CACHE_DIR
+) -> StandingsProjection:
+    """
+    Project draft slot probabilities for every team from its current record
+    (team.wins / team.losses) and roster value.
+
+    Chunks run on a process pool until all finish or the time budget runs
+    out; whatever completed is used and complete=False marks a partial run.
+    With a fingerprint (the league snapshot's), results are cached on disk.
+    """
+    team_ids = [t.team_id for t in teams]
+    wins = np.array([t.wins for t in teams], dtype=np.float64)
+    losses = np.array([t.losses for t in teams], dtype=np.float64)
+    values = np.array([roster_values.get(team_id, 0.0) for team_id in team_ids], dtype=np.float64)
+    options = {"simulations": simulations, "remaining": remaining, "seed": seed, "scale": STRENGTH_SCALE}
+
+    cache_path = None
+    if fingerprint is not None:
+        cache_path = os.path.join(cache_dir, f"{_cache_key(fingerprint, team_ids, values, options)}.json")
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return StandingsProjection.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    win_prob = win_probabilities(values)
+    chunk_sizes = [min(chunk_size, simulations - start) for start in range(0, simulations, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(wins, losses, win_prob, remaining, n, s) for n, s in zip(chunk_sizes, seeds)]
+
+    counts = np.zeros((len(team_ids), len(team_ids)), dtype=np.int64)
+    done = 0
+    if len(tasks) <= 1:
+        for task in tasks:
+            counts += _simulate_chunk(task)
+            done += task[4]
+    else:
+        started = time.perf_counter()
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {executor.submit(_simulate_chunk, task): task[4] for task in tasks}
+            try:
+                for future in as_completed(futures, timeout=time_budget):
+                    counts += future.result()
+                    done += futures[future]
+            except TimeoutError:
+                print(f"⚠️ Standings simulation hit its {time_budget:.0f}s budget after {done}/{simulations} runs")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        print(f"⏱️ Simulated {done} seasons in {time.perf_counter() - started:.2f}s")
+
+    if done == 0:
+        # Nothing finished in time: fall back to the current standings
+        current = np.argsort(np.argsort(wins / np.maximum(wins + losses, 1), kind="stable"), kind="stable")
+        probabilities = np.eye(len(team_ids))[current]
+    else:
+        probabilities = counts / done
+    projection = StandingsProjection(team_ids, probabilities, done, complete=done == simulations)
+
+    if cache_path is not None and projection.complete:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(projection.to_dict(), f)
+        os.replace(tmp_path, cache_path)
+    return projection
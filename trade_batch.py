@@ -0,0 +1,218 @@
+"""
+Batch trade evaluation: score many (team A assets, team B assets) proposals
+in one vectorized pass instead of calling app.calculate_trade_value per trade.
+
+Usage: python trade_batch.py proposals.json [--mode advanced] [--output scores.csv]
+
+proposals.json is a JSON list (or a .jsonl file, one proposal per line) of
+    {"team_a": 1, "team_b": 2,
+     "players_a": ["Player sent by A", ...], "players_b": [...],
+     "picks_a": [1, [2, 2028]], "picks_b": [2]}
+where picks are the draft rounds each side gives up, either a bare round
+(next draft) or a [round, year] pair for a later draft.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from draft_value import TEAM_COUNT
+from player_index import PlayerIndex
+from player_value import simple_pick_values
+from rankings import clean_player_name
+from rankings_store import get_store
+
+@dataclass
+class TradeProposal:
+    team_a: int
+    team_b: int
+    players_a: List[str] = field(default_factory=list)  # sent by team A
+    players_b: List[str] = field(default_factory=list)  # sent by team B
+    picks_a: List[Tuple[int, Optional[int]]] = field(default_factory=list)  # (round, year) sent by team A
+    picks_b: List[Tuple[int, Optional[int]]] = field(default_factory=list)  # (round, year) sent by team B
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TradeProposal":
+        return cls(
+            team_a=int(data["team_a"]),
+            team_b=int(data["team_b"]),
+            players_a=list(data.get("players_a", [])),
+            players_b=list(data.get("players_b", [])),
+            picks_a=[_parse_pick(p) for p in data.get("picks_a", [])],
+            picks_b=[_parse_pick(p) for p in data.get("picks_b", [])],
+        )
+
+def _parse_pick(pick) -> Tuple[int, Optional[int]]:
+    """A bare round (next draft) or a [round, year] pair."""
+    if isinstance(pick, (list, tuple)):
+        return int(pick[0]), (int(pick[1]) if len(pick) > 1 and pick[1] is not None else None)
+    return int(pick), None
+
+def _flatten(proposals: Sequence[TradeProposal], side: str, first_year: Optional[int]) -> Tuple[np.ndarray, List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten one side's assets into (proposal ids, player names, pick proposal ids, pick teams, pick rounds, pick years out)."""
+    player_owner, names = [], []
+    pick_owner, pick_teams, pick_rounds, pick_years = [], [], [], []
+    for i, p in enumerate(proposals):
+        team = p.team_a if side == "a" else p.team_b
+        players = p.players_a if side == "a" else p.players_b
+        picks = p.picks_a if side == "a" else p.picks_b
+        player_owner.extend([i] * len(players))
+        names.extend(players)
+        pick_owner.extend([i] * len(picks))
+        pick_teams.extend([team] * len(picks))
+        for rnd, year in picks:
+            pick_rounds.append(rnd)
+            pick_years.append(0 if year is None or first_year is None else year - first_year)
+    return (
+        np.asarray(player_owner, dtype=np.int64),
+        names,
+        np.asarray(pick_owner, dtype=np.int64),
+        np.asarray(pick_teams, dtype=np.int64),
+        np.asarray(pick_rounds, dtype=np.int64),
+        np.asarray(pick_years, dtype=np.int64),
+    )
+
+def _resolve_rows(index: PlayerIndex, names: List[str]) -> np.ndarray:
+    """Index rows for raw roster names; each distinct name is cleaned and looked up once."""
+    unique = list(dict.fromkeys(names))
+    unique_rows = index.rows_of([clean_player_name(name) for name in unique])
+    slot = {name: i for i, name in enumerate(unique)}
+    return unique_rows[np.fromiter((slot[name] for name in names), dtype=np.int64, count=len(names))]
+
+def pick_value_table(pick_valuator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dense (year, team, round) pick-value table from a DraftPickValuator.
+    Returns (sorted team ids, values[year_offset, team_slot, round - 1]).
+    """
+    team_ids = np.asarray(pick_valuator.team_ids, dtype=np.int64)
+    order = np.argsort(team_ids, kind="stable")
+    return team_ids[order], pick_valuator.year_values[:, order]
+
+def _pick_values(teams: np.ndarray, rounds: np.ndarray, years_out: np.ndarray, pick_valuator=None, mode="simple", team_count=TEAM_COUNT) -> np.ndarray:
+    if not (mode == "advanced" and pick_valuator is not None):
+        return simple_pick_values(rounds, team_count, years_out) if len(rounds) else np.zeros(0)
+
+    team_ids, table = pick_value_table(pick_valuator)
+    values = np.zeros(len(rounds), dtype=np.float64)
+    if len(team_ids) == 0:
+        return values
+    slots = np.minimum(np.searchsorted(team_ids, teams), len(team_ids) - 1)
+    valid = (
+        (team_ids[slots] == teams)
+        & (rounds >= 1) & (rounds <= table.shape[2])
+        & (years_out >= 0) & (years_out < table.shape[0])
+    )
+    values[valid] = table[years_out[valid], slots[valid], rounds[valid] - 1]
+    return values
+
+def evaluate_trades(
+    proposals: Sequence[TradeProposal],
+    index: Optional[PlayerIndex] = None,
+    pick_valuator=None,
+    mode: str = "simple",
+    team_count: int = TEAM_COUNT,
+    first_year: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Score every proposal at once. Player values come from the rankings
+    index value vector and pick values from a pick-value table, so the
+    cost is a handful of gathers and bincounts regardless of batch size.
+
+    Returns one row per proposal: value_a (what team A gives up),
+    value_b (what team B gives up) and delta (value_b - value_a, team A's net gain).
+    Matches calculate_trade_value for each side. Pick years are counted from
+    first_year (default: the valuator's first draft year).
+    """
+    proposals = [p if isinstance(p, TradeProposal) else TradeProposal.from_dict(p) for p in proposals]
+    index = index if index is not None else get_store().index
+    n = len(proposals)
+    if first_year is None and pick_valuator is not None:
+        first_year = pick_valuator.first_year
+
+    sides: Dict[str, np.ndarray] = {}
+    for side in ("a", "b"):
+        player_owner, names, pick_owner, pick_teams, pick_rounds, pick_years = _flatten(proposals, side, first_year)
+        rows = _resolve_rows(index, names) if names else np.zeros(0, dtype=np.int64)
+        player_values = np.zeros(len(rows), dtype=np.float64)
+        found = rows >= 0
+        player_values[found] = index.values[rows[found]]
+
+        pick_values = _pick_values(pick_teams, pick_rounds, pick_years, pick_valuator, mode, team_count)
+        sides[side] = (
+            np.bincount(player_owner, weights=player_values, minlength=n)
+            + np.bincount(pick_owner, weights=pick_values, minlength=n)
+        )
+
+    return pd.DataFrame({
+        "team_a": [p.team_a for p in proposals],
+        "team_b": [p.team_b for p in proposals],
+        "value_a": sides["a"],
+        "value_b": sides["b"],
+        "delta": sides["b"] - sides["a"],
+    })
+
+def load_proposals(path) -> List[TradeProposal]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+    return [TradeProposal.from_dict(r) for r in records]
+
+def _standings_valuator(league, years: int):
+    from draft_value import get_valuator
+
+    # Worst-to-best, same ordering the app uses for advanced pick values
+    return get_valuator(
+        [t.team_id for t in sorted(league.teams, key=lambda t: t.wins)],
+        years=years,
+        first_year=league.year + 1,
+    )
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Score a batch of trade proposals.")
+    parser.add_argument("proposals", help="JSON list or JSONL file of proposals")
+    parser.add_argument("--mode", choices=["simple", "advanced"], default="simple", help="draft pick valuation mode")
+    parser.add_argument("--teams", type=int, help=f"league size for simple pick values (default: from the league, else {TEAM_COUNT})")
+    parser.add_argument("--first-year", type=int, help="next draft year; later years are discounted (default: from the league)")
+    parser.add_argument("--years", type=int, default=3, help="future drafts valued in advanced mode (default 3)")
+    parser.add_argument("--output", help="write scores to this CSV instead of printing them")
+    args = parser.parse_args()
+
+    proposals = load_proposals(args.proposals)
+    league = None
+    if args.mode == "advanced" or args.teams is None or args.first_year is None:
+        from update_rankings import load_espn_league
+        league = load_espn_league()
+
+    pick_valuator = _standings_valuator(league, args.years) if args.mode == "advanced" and league is not None else None
+    if args.mode == "advanced" and pick_valuator is None:
+        print("⚠️ Could not load league standings; falling back to simple pick values.")
+    if league is None and args.first_year is None:
+        print("⚠️ Could not load the league; pass --first-year to discount later-year picks.")
+
+    # Same defaults the app uses: the league's size and the draft after its season
+    team_count = args.teams if args.teams is not None else (len(league.teams) if league is not None else TEAM_COUNT)
+    first_year = args.first_year if args.first_year is not None else (league.year + 1 if league is not None else None)
+
+    start = time.perf_counter()
+    scores = evaluate_trades(
+        proposals,
+        pick_valuator=pick_valuator,
+        mode=args.mode,
+        team_count=pick_valuator.team_count if pick_valuator else team_count,
+        first_year=first_year,
+    )
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        scores.to_csv(args.output, index=False)
+        print(f"✅ Scored {len(scores)} trades in {elapsed * 1000:.1f} ms, saved to {args.output}")
+    else:
+        print(scores.to_string(index=False))
+        print(f"✅ Scored {len(scores)} trades in {elapsed * 1000:.1f} ms")
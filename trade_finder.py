@@ -0,0 +1,225 @@
+"""
+Search two rosters for balanced trades.
+
+Each side's players and picks are valued once (the same numbers
+calculate_trade_value sums), every package of up to max_size assets is
+enumerated as a subset-sum array, and the two sides are matched
+meet-in-the-middle style: sort one side's sums and binary-search it for each
+package on the other side, instead of comparing every pair of packages.
+"""
+import itertools
+import time
+from dataclasses import dataclass, field
+from math import comb
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from draft_value import TEAM_COUNT
+from player_value import simple_pick_values
+
+DEFAULT_ROUNDS = 16
+DEFAULT_MAX_ASSETS = 24  # most valuable assets per side considered
+MAX_PACKAGES_PER_SIZE = 2_000_000  # larger package sizes are left unexplored
+MATCH_CHUNK = 50_000  # A packages matched per vectorized step
+
+@dataclass
+class TradePackage:
+    players_a: List[str]
+    picks_a: List[Tuple[int, Optional[int]]]  # (round, year)
+    players_b: List[str]
+    picks_b: List[Tuple[int, Optional[int]]]
+    value_a: float  # what team A gives up
+    value_b: float  # what team B gives up
+
+    @property
+    def difference(self) -> float:
+        return abs(self.value_a - self.value_b)
+
+    @property
+    def total(self) -> float:
+        return self.value_a + self.value_b
+
+@dataclass
+class TradeSearchResult:
+    packages: List[TradePackage] = field(default_factory=list)
+    complete: bool = True  # False when the time budget cut the search short
+    packages_considered: int = 0
+    elapsed: float = 0.0
+
+def team_assets(
+    league_values,
+    team_id,
+    pick_valuator=None,
+    mode: str = "simple",
+    rounds: int = DEFAULT_ROUNDS,
+    include_picks: bool = True,
+    team_count: int = TEAM_COUNT,
+    years: int = 1,
+    first_year: Optional[int] = None
+) -> Tuple[List[Tuple[str, object]], np.ndarray]:
+    """
+    A team's tradeable assets as ([("player", name) | ("pick", (round, year))], values),
+    valued exactly as calculate_trade_value would value them. Picks cover
+    `years` drafts from first_year (year None when first_year isn't known).
+    """
+    table = league_values.team_table(team_id)
+    assets: List[Tuple[str, object]] = [("player", name) for name in table["player"]]
+    values = [table["dynasty_value"]]
+
+    if include_picks and rounds > 0:
+        years = years if first_year is not None else 1
+        round_numbers = np.tile(np.arange(1, rounds + 1), years)
+        years_out = np.repeat(np.arange(years), rounds)
+        pick_years = [None if first_year is None else first_year + int(y) for y in years_out]
+        if mode == "advanced" and pick_valuator is not None:
+            pick_values = np.array(
+                [pick_valuator.get_pick_value(team_id, int(r), y) for r, y in zip(round_numbers, pick_years)],
+                dtype=np.float64,
+            )
+        else:
+            pick_values = simple_pick_values(round_numbers, team_count, years_out)
+        assets.extend(("pick", (int(r), y)) for r, y in zip(round_numbers, pick_years))
+        values.append(pick_values)
+
+    return assets, np.concatenate(values).astype(np.float64)
+
+def _prune(assets, values, max_assets):
+    """Keep the max_assets most valuable assets; zero-value assets never change a trade's balance."""
+    order = np.argsort(-values, kind="stable")
+    order = order[values[order] > 0][:max_assets]
+    return [assets[i] for i in order], values[order]
+
+def _package_sums(values: np.ndarray, max_size: int, deadline: float) -> Tuple[List[Tuple[np.ndarray, np.ndarray]], bool]:
+    """Subset sums of every package of 1..max_size assets, one (combos, sums) block per size."""
+    blocks = []
+    n = len(values)
+    for size in range(1, min(max_size, n) + 1):
+        if time.perf_counter() > deadline or comb(n, size) > MAX_PACKAGES_PER_SIZE:
+            return blocks, False
+        flat = np.fromiter(
+            itertools.chain.from_iterable(itertools.combinations(range(n), size)),
+            dtype=np.int64,
+            count=comb(n, size) * size,
+        )
+        combos = flat.reshape(-1, size)
+        blocks.append((combos, values[combos].sum(axis=1)))
+    return blocks, True
+
+def _package(assets, combo) -> Tuple[List[str], List[Tuple[int, Optional[int]]]]:
+    players = [assets[i][1] for i in combo if assets[i][0] == "player"]
+    picks = sorted((assets[i][1] for i in combo if assets[i][0] == "pick"), key=lambda p: (p[1] or 0, p[0]))
+    return players, picks
+
+def find_balanced_trades(
+    assets_a,
+    values_a: np.ndarray,
+    assets_b,
+    values_b: np.ndarray,
+    tolerance: float = 10.0,
+    max_size: int = 3,
+    top_n: int = 10,
+    min_value: float = 0.0,
+    max_assets: int = DEFAULT_MAX_ASSETS,
+    time_budget: float = 5.0
+) -> TradeSearchResult:
+    """
+    Return up to top_n package pairs whose values differ by at most tolerance,
+    most balanced first (larger deals break ties). Packages worth less than
+    min_value are ignored. Stops enumerating at the time budget and returns
+    the best trades found so far with complete=False.
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget
+    result = TradeSearchResult()
+
+    assets_a, values_a = _prune(assets_a, np.asarray(values_a, dtype=np.float64), max_assets)
+    assets_b, values_b = _prune(assets_b, np.asarray(values_b, dtype=np.float64), max_assets)
+    if len(values_a) == 0 or len(values_b) == 0:
+        return result
+
+    blocks_a, done_a = _package_sums(values_a, max_size, deadline)
+    blocks_b, done_b = _package_sums(values_b, max_size, deadline)
+    result.complete = done_a and done_b
+    if not blocks_a or not blocks_b:
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # Flatten B's packages into one sorted sum array with (block, row) back-references
+    sums_b = np.concatenate([sums for _, sums in blocks_b])
+    block_b = np.concatenate([np.full(len(sums), i) for i, (_, sums) in enumerate(blocks_b)])
+    row_b = np.concatenate([np.arange(len(sums)) for _, sums in blocks_b])
+    keep = sums_b >= min_value
+    sums_b, block_b, row_b = sums_b[keep], block_b[keep], row_b[keep]
+    order = np.argsort(sums_b, kind="stable")
+    sums_b, block_b, row_b = sums_b[order], block_b[order], row_b[order]
+    if len(sums_b) == 0:
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # The top_n closest B packages to any A package are its top_n sorted neighbours
+    offsets = np.arange(-top_n, top_n)
+    best: List[Tuple[float, float, int, int, int]] = []
+    timed_out = False
+    for block_a, (combos_a, sums_a) in enumerate(blocks_a):
+        candidates = np.flatnonzero(sums_a >= min_value)
+        for chunk_start in range(0, len(candidates), MATCH_CHUNK):
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+            rows_a = candidates[chunk_start:chunk_start + MATCH_CHUNK]
+            result.packages_considered += len(rows_a) * len(sums_b)
+
+            positions = np.searchsorted(sums_b, sums_a[rows_a])
+            neighbours = positions[:, None] + offsets[None, :]
+            valid = (neighbours >= 0) & (neighbours < len(sums_b))
+            a_idx = np.broadcast_to(rows_a[:, None], neighbours.shape)[valid]
+            b_idx = neighbours[valid]
+            diff = np.abs(sums_b[b_idx] - sums_a[a_idx])
+            within = diff <= tolerance
+            a_idx, b_idx, diff = a_idx[within], b_idx[within], diff[within]
+            if len(diff) > top_n:
+                keep = np.argpartition(diff, top_n - 1)[:top_n]
+                a_idx, b_idx, diff = a_idx[keep], b_idx[keep], diff[keep]
+            best.extend(
+                (float(d), -float(sums_a[a] + sums_b[b]), block_a, int(a), int(b))
+                for d, a, b in zip(diff, a_idx, b_idx)
+            )
+        if timed_out:
+            result.complete = False
+            break
+
+    for _, _, block_a, a, b in sorted(best)[:top_n]:
+        combos_a, sums_a = blocks_a[block_a]
+        combos_b, sums_b_block = blocks_b[block_b[b]]
+        players_a, picks_a = _package(assets_a, combos_a[a])
+        players_b, picks_b = _package(assets_b, combos_b[row_b[b]])
+        result.packages.append(TradePackage(
+            players_a=players_a,
+            picks_a=picks_a,
+            players_b=players_b,
+            picks_b=picks_b,
+            value_a=round(float(sums_a[a]), 2),
+            value_b=round(float(sums_b_block[row_b[b]]), 2),
+        ))
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def find_trades_between(
+    league_values,
+    team_a_id,
+    team_b_id,
+    pick_valuator=None,
+    mode: str = "simple",
+    rounds: int = DEFAULT_ROUNDS,
+    include_picks: bool = True,
+    team_count: int = TEAM_COUNT,
+    years: int = 1,
+    first_year: Optional[int] = None,
+    **search_options
+) -> TradeSearchResult:
+    """find_balanced_trades over two teams' rosters (and optionally their picks in `years` drafts)."""
+    assets_a, values_a = team_assets(league_values, team_a_id, pick_valuator, mode, rounds, include_picks, team_count, years, first_year)
+    assets_b, values_b = team_assets(league_values, team_b_id, pick_valuator, mode, rounds, include_picks, team_count, years, first_year)
+    return find_balanced_trades(assets_a, values_a, assets_b, values_b, **search_options)
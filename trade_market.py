@@ -0,0 +1,241 @@
+"""
+League-wide trade market: scan every team pair for mutually beneficial
+trades, where each side gives up players at positions it is deep in and
+receives players at positions it is short on.
+
+Pairs are searched on a process pool and streamed back as they finish;
+the scan stops at a fixed wall-clock budget. Results are cached on disk
+per league snapshot and rankings values, so reopening the page is instant.
+"""
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from trade_finder import TradePackage, find_balanced_trades
+
+CACHE_DIR = os.path.join("data", "cache", "market_scan")
+SCAN_BUDGET = 60.0  # seconds for the whole league
+PAIR_BUDGET = 5.0  # seconds per team pair
+
+@dataclass
+class MarketTrade:
+    team_a: int
+    team_b: int
+    package: TradePackage
+    need_gain_a: float  # value team A receives at positions it is short on
+    need_gain_b: float
+
+    @property
+    def score(self) -> float:
+        # Mutual benefit: a trade is only as good as it is for the side gaining less
+        return min(self.need_gain_a, self.need_gain_b)
+
+@dataclass
+class PairResult:
+    team_a: int
+    team_b: int
+    trades: List[MarketTrade] = field(default_factory=list)
+
+def positional_needs(league_values) -> Dict[int, Dict[str, float]]:
+    """
+    Per team, league-average positional value minus the team's own:
+    positive where a team is short, negative where it has surplus.
+    """
+    totals = {team_id: league_values.positional_value(team_id) for team_id in league_values.tables}
+    positions = sorted({pos for by_pos in totals.values() for pos in by_pos})
+    if not totals:
+        return {}
+    average = {pos: float(np.mean([by_pos.get(pos, 0.0) for by_pos in totals.values()])) for pos in positions}
+    return {
+        team_id: {pos: round(average[pos] - by_pos.get(pos, 0.0), 2) for pos in positions}
+        for team_id, by_pos in totals.items()
+    }
+
+def _tradeable(table, own_need, other_need):
+    """Players at positions this team has surplus in and the other team needs."""
+    keep = [
+        i for i, pos in enumerate(table["position"])
+        if own_need.get(pos, 0.0) < 0 < other_need.get(pos, 0.0) and table["dynasty_value"][i] > 0
+    ]
+    return (
+        [("player", table["player"][i]) for i in keep],
+        np.asarray(table["dynasty_value"][keep], dtype=np.float64),
+        {table["player"][i]: table["position"][i] for i in keep},
+    )
+
+def _need_gain(players, positions, values, need) -> float:
+    """Received value, capped per position at how short the receiver is there."""
+    by_pos: Dict[str, float] = {}
+    for name in players:
+        by_pos[positions[name]] = by_pos.get(positions[name], 0.0) + values[name]
+    return round(sum(min(value, max(need.get(pos, 0.0), 0.0)) for pos, value in by_pos.items()), 2)
+
+def scan_pair(task) -> PairResult:
+    """Process-pool worker: search one team pair. Takes and returns picklable data only."""
+    team_a, team_b, give_a, give_b, need_a, need_b, options = task
+    assets_a, values_a, positions_a = give_a
+    assets_b, values_b, positions_b = give_b
+    result = PairResult(team_a, team_b)
+    if len(values_a) == 0 or len(values_b) == 0:
+        return result
+
+    search = find_balanced_trades(
+        assets_a, values_a, assets_b, values_b,
+        tolerance=options["tolerance"],
+        max_size=options["max_size"],
+        top_n=options["top_n"] * 4,
+        min_value=options["min_value"],
+        time_budget=options["pair_budget"],
+    )
+    value_of = {name: float(v) for (_, name), v in zip(assets_a, values_a)}
+    value_of.update({name: float(v) for (_, name), v in zip(assets_b, values_b)})
+    for package in search.packages:
+        result.trades.append(MarketTrade(
+            team_a=team_a,
+            team_b=team_b,
+            package=package,
+            need_gain_a=_need_gain(package.players_b, positions_b, value_of, need_a),
+            need_gain_b=_need_gain(package.players_a, positions_a, value_of, need_b),
+        ))
+    result.trades.sort(key=lambda t: -t.score)
+    result.trades = result.trades[:options["top_n"]]
+    return result
+
+def _cache_key(league_values, fingerprint, options) -> str:
+    h = hashlib.sha1()
+    h.update(str(fingerprint).encode("utf-8"))
+    h.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    # Rankings values, so a rankings refresh invalidates the scan too
+    for team_id in sorted(league_values.tables):
+        h.update(str(team_id).encode("utf-8"))
+        h.update(league_values.tables[team_id]["dynasty_value"].tobytes())
+    return h.hexdigest()[:20]
+
+def _pair_from_dict(data: dict) -> PairResult:
+    trades = [
+        MarketTrade(**{**t, "package": TradePackage(**t["package"])})
+        for t in data.get("trades", [])
+    ]
+    return PairResult(team_a=data["team_a"], team_b=data["team_b"], trades=trades)
+
+class MarketScan:
+    """
+    One league-wide scan. stream() yields a PairResult per team pair as it
+    completes (or straight from the cache); results, complete and from_cache
+    describe the scan afterwards.
+    """
+
+    def __init__(
+        self,
+        league_values,
+        fingerprint: str,
+        tolerance: float = 15.0,
+        max_size: int = 2,
+        top_n: int = 3,
+        min_value: float = 50.0,
+        time_budget: float = SCAN_BUDGET,
+        pair_budget: float = PAIR_BUDGET,
+        max_workers: Optional[int] = None,
+        cache_dir: str = CACHE_DIR
+    ):
+        self.league_values = league_values
+        self.options = {
+            "tolerance": tolerance,
+            "max_size": max_size,
+            "top_n": top_n,
+            "min_value": min_value,
+            "pair_budget": pair_budget,
+        }
+        self.time_budget = time_budget
+        self.max_workers = max_workers
+        self.cache_path = os.path.join(cache_dir, f"{_cache_key(league_values, fingerprint, self.options)}.json")
+        self.results: List[PairResult] = []
+        self.complete = False
+        self.from_cache = False
+
+    def _tasks(self):
+        needs = positional_needs(self.league_values)
+        for team_a, team_b in itertools.combinations(sorted(self.league_values.tables), 2):
+            table_a = self.league_values.team_table(team_a)
+            table_b = self.league_values.team_table(team_b)
+            yield (
+                team_a,
+                team_b,
+                _tradeable(table_a, needs[team_a], needs[team_b]),
+                _tradeable(table_b, needs[team_b], needs[team_a]),
+                needs[team_a],
+                needs[team_b],
+                self.options,
+            )
+
+    def _load_cache(self) -> bool:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not data.get("complete", False):
+            # Left by older versions that cached budget-limited scans
+            return False
+        self.results = [_pair_from_dict(p) for p in data.get("pairs", [])]
+        self.complete = data.get("complete", False)
+        self.from_cache = True
+        return True
+
+    def _save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"complete": self.complete, "pairs": [asdict(p) for p in self.results]}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def stream(self, force: bool = False) -> Iterator[PairResult]:
+        if not force and self._load_cache():
+            yield from self.results
+            return
+
+        self.results = []
+        tasks = list(self._tasks())
+        deadline = time.perf_counter() + self.time_budget
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [executor.submit(scan_pair, task) for task in tasks]
+            try:
+                for future in as_completed(futures, timeout=self.time_budget):
+                    try:
+                        pair = future.result()
+                    except Exception as e:
+                        print(f"Error scanning team pair: {e}")
+                        continue
+                    self.results.append(pair)
+                    yield pair
+                    if time.perf_counter() > deadline:
+                        break
+            except TimeoutError:
+                pass
+            self.complete = len(self.results) == len(tasks)
+            if not self.complete:
+                print(f"⚠️ Market scan hit its {self.time_budget:.0f}s budget after {len(self.results)}/{len(tasks)} team pairs")
+        finally:
+            # Don't block on stragglers; queued pairs are cancelled
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Partial scans aren't cached, so the next run scans every pair again
+        if self.complete:
+            self._save_cache()
+
+    def run(self, force: bool = False) -> List[PairResult]:
+        for _ in self.stream(force=force):
+            pass
+        return self.results
+
+    def best_trades(self, limit: int = 20) -> List[MarketTrade]:
+        trades = [t for pair in self.results for t in pair.trades]
+        return sorted(trades, key=lambda t: -t.score)[:limit]
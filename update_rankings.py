@@ -1,27 +1,32 @@
+import argparse
 import os
 from dotenv import load_dotenv
-from espn_api.baseball import League
+from league_snapshot import load_league_fixture, load_league_snapshot, offline_mode
 from rankings import fetch_all_sources, combine_rankings
+from rankings_io import RANKINGS_ARROW, RANKINGS_CSV
 
 def load_espn_league():
     load_dotenv()
 
     try:
+        if offline_mode():
+            # Recorded fixture; no credentials or network needed
+            return load_league_fixture()
+
         league_id = int(os.getenv("LEAGUE_ID"))
-        year = int(os.getenv("YEAR"))
+        year = int(os.getenv("SEASON_YEAR") or os.getenv("YEAR"))
         espn_s2 = os.getenv("ESPN_S2")
         swid = os.getenv("SWID")
 
         if not all([league_id, year, espn_s2, swid]):
             raise ValueError("Missing one or more required ESPN credentials in .env")
 
-        league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
-        return league
+        return load_league_snapshot(league_id, year, espn_s2=espn_s2, swid=swid)
     except Exception as e:
         print(f"❌ Error loading ESPN league: {e}")
         return None
 
-def update_rankings():
+def update_rankings(full=False):
     print("📊 Starting dynasty rankings update...")
 
     league = load_espn_league()
@@ -31,17 +36,22 @@ def update_rankings():
 
     try:
         dfs = fetch_all_sources(league)
-        combined_df = combine_rankings(dfs)
+        # Only rebuilds the rankings when a source's staged content changed, unless full is set
+        combined_df = combine_rankings(dfs, force=full)
 
         if combined_df.empty:
             print("⚠️ Combined rankings data is empty. Update aborted.")
             return
 
-        output_path = os.path.join("data", "dynasty_rankings_cleaned.csv")
-        combined_df.to_csv(output_path, index=False)
-        print(f"✅ Dynasty rankings successfully updated and saved to {output_path}")
+        print(f"✅ Dynasty rankings are up to date in {RANKINGS_ARROW} and {RANKINGS_CSV}")
     except Exception as e:
         print(f"❌ Error during rankings update: {e}")
 
 if __name__ == "__main__":
-    update_rankings()
+    parser = argparse.ArgumentParser(description="Rebuild the dynasty rankings from every source.")
+    parser.add_argument("--offline", action="store_true", help="use the recorded league fixture instead of ESPN")
+    parser.add_argument("--full", action="store_true", help="rebuild and rewrite the rankings even if no source changed")
+    args = parser.parse_args()
+    if args.offline:
+        os.environ["LEAGUE_OFFLINE"] = "1"
+    update_rankings(full=args.full)
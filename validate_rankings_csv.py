@@ -1,14 +1,16 @@
 import pandas as pd
+from rankings_io import read_rankings_file
 
 def validate_rankings_csv(filepath: str) -> bool:
     """
-    Validate the dynasty rankings CSV file to ensure it has required columns
-    and reasonable data.
+    Validate the dynasty rankings file (CSV export or Arrow store) to ensure
+    it has required columns and reasonable data.
     Returns True if valid, False otherwise.
     """
     required_columns = {"name", "overall_rank", "dynasty_value", "position", "pos_rank"}
     try:
-        df = pd.read_csv(filepath)
+        # The Arrow store has a fixed schema; CSVs are checked as written
+        df = read_rankings_file(filepath) if filepath.endswith(".arrow") else pd.read_csv(filepath)
     except Exception as e:
         print(f"❌ Failed to read {filepath}: {e}")
         return False
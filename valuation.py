@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from player_index import PITCHER_POSITIONS, STAT_COLUMNS, STAT_DEFAULTS, numeric_matrix
+
+# Linear weights per stat, matching dynasty_value_hitter / dynasty_value_pitcher
+HITTER_WEIGHTS = {"HR": 4.0, "R": 1.0, "RBI": 1.0, "SB": 2.0, "AVG": 50.0, "BB": 1.0}
+PITCHER_WEIGHTS = {"W": 5.0, "SV": 5.0, "K": 1.0, "IP": 0.5}
+
+# Ratio stats only score below a league-average baseline
+ERA_BASELINE, ERA_WEIGHT = 4.0, 20.0
+WHIP_BASELINE, WHIP_WEIGHT = 1.3, 30.0
+
+def _weight_vector(weights: dict) -> np.ndarray:
+    return np.array([weights.get(col, 0.0) for col in STAT_COLUMNS], dtype=np.float64)
+
+_HITTER_VECTOR = _weight_vector(HITTER_WEIGHTS)
+_PITCHER_VECTOR = _weight_vector(PITCHER_WEIGHTS)
+_ERA = STAT_COLUMNS.index("ERA")
+_WHIP = STAT_COLUMNS.index("WHIP")
+
+def dynasty_values_from_matrix(stats: np.ndarray, is_pitcher: np.ndarray) -> np.ndarray:
+    """
+    Vectorized dynasty value for a (players x STAT_COLUMNS) stat matrix.
+
+    Computes the hitter and pitcher formulas for every row with column
+    arithmetic and picks one per row with the pitcher mask. The scalar
+    dynasty_value_hitter / dynasty_value_pitcher functions remain the
+    reference implementation; results agree to the rounded cent.
+    """
+    hitter = stats @ _HITTER_VECTOR
+    pitcher = (
+        stats @ _PITCHER_VECTOR
+        + np.maximum(0.0, ERA_BASELINE - stats[:, _ERA]) * ERA_WEIGHT
+        + np.maximum(0.0, WHIP_BASELINE - stats[:, _WHIP]) * WHIP_WEIGHT
+    )
+    return np.round(np.where(is_pitcher, pitcher, hitter), 2)
+
+def pitcher_mask(df: pd.DataFrame) -> np.ndarray:
+    if "position" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df["position"].astype(str).str.upper().isin(PITCHER_POSITIONS).to_numpy()
+
+def dynasty_values(df: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized dynasty value for every row of a rankings/stats DataFrame.
+    Missing stat columns take the same defaults as the scalar formulas.
+    """
+    return dynasty_values_from_matrix(numeric_matrix(df, STAT_COLUMNS, STAT_DEFAULTS), pitcher_mask(df))
+
+# Bump whenever the formulas above change shape (not just their weights)
+VALUATION_VERSION = 1
+
+def valuation_metadata() -> dict:
+    """
+    Describe the current valuation formula. Stored next to the rankings file so
+    persisted dynasty_value columns can be checked against the code that reads them.
+    """
+    params = {
+        "hitter_weights": HITTER_WEIGHTS,
+        "pitcher_weights": PITCHER_WEIGHTS,
+        "era": [ERA_BASELINE, ERA_WEIGHT],
+        "whip": [WHIP_BASELINE, WHIP_WEIGHT],
+    }
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return {"valuation_version": f"{VALUATION_VERSION}-{digest}", **params}
+
+def metadata_path(rankings_file: str) -> str:
+    return os.path.splitext(rankings_file)[0] + ".meta.json"
+
+def read_metadata(rankings_file: str) -> dict:
+    try:
+        with open(metadata_path(rankings_file), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_metadata(rankings_file: str, **extra) -> dict:
+    meta = {**valuation_metadata(), **extra}
+    with open(metadata_path(rankings_file), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    return meta
+
+def ensure_current_values(df: pd.DataFrame, rankings_file: str) -> pd.DataFrame:
+    """
+    Trust the persisted dynasty_value column when the file was stamped with the
+    current valuation version; otherwise recompute it in place so stale values
+    are never served.
+    """
+    stamped = read_metadata(rankings_file).get("valuation_version")
+    current = valuation_metadata()["valuation_version"]
+    if stamped != current or "dynasty_value" not in df.columns:
+        print(f"⚠️ Rankings valued with formula {stamped or 'unknown'}, recomputing with {current}")
+        df["dynasty_value"] = dynasty_values(df)
+    return df